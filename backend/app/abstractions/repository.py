@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, Tuple, Any
+from typing import Generic, TypeVar, Optional, Tuple, Any, Sequence, List, Iterable, Set
 
 from pydantic import BaseModel
+from sqlalchemy.engine import Row
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -30,6 +31,33 @@ class ICrudRepository(ABC, Generic[ModelType, CreateType, UpdateType]):
         """
         pass
 
+    @staticmethod
+    @abstractmethod
+    async def insert(db: AsyncSession, db_obj: ModelType, refresh: bool = False) -> ModelType:
+        """
+        Вставляет новый объект одним INSERT с возвратом сгенерированных значений.
+
+        :param db: Асинхронная сессия базы данных.
+        :param db_obj: Новый объект модели.
+        :param refresh: Перечитать объект из базы после вставки.
+        :return: Вставленный объект модели.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    async def persist(db: AsyncSession, db_obj: ModelType, merge: bool = False, refresh: bool = False) -> ModelType:
+        """
+        Сохраняет изменения объекта, выполняя merge и повторное чтение только по запросу.
+
+        :param db: Асинхронная сессия базы данных.
+        :param db_obj: Объект модели.
+        :param merge: Объединить объект с сессией.
+        :param refresh: Перечитать объект из базы после сохранения.
+        :return: Сохранённый объект модели.
+        """
+        pass
+
     @abstractmethod
     async def update(self, db: AsyncSession, model: ModelType, schema: UpdateType | dict) -> ModelType:
         """
@@ -42,6 +70,52 @@ class ICrudRepository(ABC, Generic[ModelType, CreateType, UpdateType]):
         """
         pass
 
+    @abstractmethod
+    async def bulk_create(self, db: AsyncSession, items: Sequence[CreateType | dict], **kwargs) -> List[ModelType]:
+        """
+        Создаёт объекты пакетами, по одному INSERT ... RETURNING на пакет.
+
+        :param db: Асинхронная сессия базы данных.
+        :param items: Данные для создания объектов (схемы или словари).
+        :param kwargs: Дополнительные значения полей, общие для всех объектов.
+        :return: Созданные объекты модели в порядке входных данных.
+        """
+        pass
+
+    @abstractmethod
+    async def bulk_update(self, db: AsyncSession, values: Sequence[dict]) -> int:
+        """
+        Обновляет объекты по первичному ключу пакетами через executemany.
+
+        :param db: Асинхронная сессия базы данных.
+        :param values: Словари с первичным ключом и обновляемыми полями.
+        :return: Количество переданных на обновление строк.
+        """
+        pass
+
+    @abstractmethod
+    async def bulk_delete(self, db: AsyncSession, ids: Sequence[Any]) -> int:
+        """
+        Удаляет объекты по первичному ключу пакетами.
+
+        :param db: Асинхронная сессия базы данных.
+        :param ids: Идентификаторы удаляемых объектов.
+        :return: Количество удалённых строк.
+        """
+        pass
+
+    @abstractmethod
+    async def get_columns(self, db: AsyncSession, columns: Sequence[Any], **kwargs) -> Optional[Row]:
+        """
+        Получает указанные колонки одной записи без создания объекта модели.
+
+        :param db: Асинхронная сессия базы данных.
+        :param columns: Колонки модели, например (User.id, User.hashed_password).
+        :param kwargs: Параметры для фильтрации.
+        :return: Строка с выбранными колонками или None, если запись не найдена.
+        """
+        pass
+
     @abstractmethod
     async def get(self, db: AsyncSession, **kwargs) -> Optional[ModelType]:
         """
@@ -100,6 +174,44 @@ class IQueryRepository(ABC, Generic[ModelType]):
         """
         pass
 
+    @abstractmethod
+    async def count(self, db: AsyncSession, *filters) -> int:
+        """
+        Подсчитывает объекты, соответствующие фильтрам.
+
+        :param db: Асинхронная сессия базы данных.
+        :param filters: Фильтры для выполнения запроса.
+        :return: Количество объектов.
+        """
+        pass
+
+    @abstractmethod
+    async def exists_many(self, db: AsyncSession, column, values: Iterable[Any]) -> Set[Any]:
+        """
+        Проверяет существование пакета значений колонки одним запросом.
+
+        :param db: Асинхронная сессия базы данных.
+        :param column: Колонка модели, по которой выполняется проверка (например, Payment.transaction_id).
+        :param values: Проверяемые значения.
+        :return: Множество значений, для которых объект существует.
+        """
+        pass
+
+    @abstractmethod
+    async def project(self, db: AsyncSession, columns: Sequence[Any], *filters, order_by=None,
+                      limit: Optional[int] = None) -> List[Row]:
+        """
+        Выбирает указанные колонки объектов, соответствующих фильтрам, без создания объектов модели.
+
+        :param db: Асинхронная сессия базы данных.
+        :param columns: Колонки модели.
+        :param filters: Фильтры для выполнения запроса.
+        :param order_by: Выражения сортировки.
+        :param limit: Максимальное количество строк.
+        :return: Список строк (именованных кортежей).
+        """
+        pass
+
     @abstractmethod
     async def base_filter(self, db: AsyncSession, *filters, options=None):
         """
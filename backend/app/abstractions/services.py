@@ -18,3 +18,11 @@ class IPasswordService(ABC):
     @abstractmethod
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         pass
+
+    @abstractmethod
+    async def hash_password_async(self, password: str) -> str:
+        pass
+
+    @abstractmethod
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        pass
@@ -1,9 +1,15 @@
-from fastapi import APIRouter
-from backend.app.dependencies.auth_dep import CurrentUser
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from backend.app.dependencies.auth_dep import CurrentUser, CurrentPrincipal
 from backend.app.dependencies.services import account_service
 from backend.app.models.account import AccountRead, AccountReadWithPayments
+from backend.app.models.payment import PaymentStatementPage
 
-from backend.core.db import TransactionSessionDep, SessionDep
+from backend.core.config import settings
+from backend.core.db import TransactionSessionDep, ReadSessionDep
+from backend.core.responses import FastJSONResponse
 
 account_router = APIRouter()
 
@@ -23,7 +29,7 @@ async def create_account(db: TransactionSessionDep, current_user: CurrentUser):
 
 
 @account_router.post('/account/{account_id}', response_model=AccountReadWithPayments)
-async def get_account_with_transactions(db: SessionDep, account_id: int, current_user: CurrentUser):
+async def get_account_with_transactions(db: ReadSessionDep, account_id: int, current_user: CurrentPrincipal):
     """
         Получает информацию о счёте с указанным ID, включая связанные транзакции.
 
@@ -34,4 +40,46 @@ async def get_account_with_transactions(db: SessionDep, account_id: int, current
         :param current_user: Текущий авторизованный пользователь.
         :return: Данные счёта и его транзакции.
         """
+    if settings.FAST_SERIALIZATION:
+        return FastJSONResponse(await account_service.get_account_data(db, account_id, current_user))
     return await account_service.get_account(db, account_id, current_user)
+
+
+@account_router.get('/account/{account_id}/statement', response_model=PaymentStatementPage)
+async def get_account_statement(db: ReadSessionDep, account_id: int, current_user: CurrentPrincipal,
+                                limit: Annotated[int, Query(ge=1, le=500)] = 50,
+                                cursor: Optional[str] = None):
+    """
+        Получает выписку по счёту постранично, от новых платежей к старым.
+
+        Доступ разрешён только владельцу счёта.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: Уникальный идентификатор счёта.
+        :param current_user: Текущий авторизованный пользователь.
+        :param limit: Количество платежей на странице.
+        :param cursor: Курсор next_cursor из предыдущей страницы.
+        :return: Страница платежей и курсор следующей страницы.
+        """
+    if settings.FAST_SERIALIZATION:
+        return FastJSONResponse(await account_service.get_statement_data(db, account_id, current_user, limit, cursor))
+    return await account_service.get_statement(db, account_id, current_user, limit, cursor)
+
+
+@account_router.get('/account/{account_id}/statement/export')
+async def export_account_statement(db: ReadSessionDep, account_id: int, current_user: CurrentPrincipal,
+                                   export_format: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson"):
+    """
+        Потоково выгружает полную выписку по счёту в формате NDJSON или CSV.
+
+        Доступ разрешён только владельцу счёта.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: Уникальный идентификатор счёта.
+        :param current_user: Текущий авторизованный пользователь.
+        :param export_format: Формат выгрузки.
+        :return: Потоковый ответ с платежами счёта.
+        """
+    await account_service.verify_statement_access(db, account_id, current_user)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(account_service.export_statement(account_id, export_format), media_type=media_type)
@@ -0,0 +1,60 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.app.dependencies.services import password_service
+from backend.core.db import session_manager, read_session_manager
+from backend.core.metrics import registry, render_gauges, render_histogram, render_samples
+
+metrics_router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@registry.collector
+def collect_password_pool() -> List[str]:
+    """Состояние пула потоков bcrypt."""
+    stats = password_service.stats()
+    lines = render_gauges("password_hash_pool", "Состояние пула потоков bcrypt", [
+        ({"state": state}, stats[state]) for state in ("workers", "in_progress", "queued")
+    ])
+    lines += render_samples("password_hash_rejected_total", "Операции bcrypt, отклонённые из-за переполнения очереди",
+                            "counter", [({}, stats["rejected"])])
+    lines += ["# HELP password_hash_queue_seconds Время ожидания свободного потока bcrypt",
+              "# TYPE password_hash_queue_seconds histogram"]
+    lines += render_histogram("password_hash_queue_seconds", {}, password_service.queue_time)
+    return lines
+
+
+@registry.collector
+def collect_db_pools() -> List[str]:
+    """Состояние пулов соединений основной базы и реплики."""
+    managers = {"primary": session_manager}
+    if read_session_manager is not session_manager:
+        managers["replica"] = read_session_manager
+
+    samples = []
+    wait_lines = []
+    for name, manager in managers.items():
+        stats = manager.pool_stats()
+        samples += [
+            ({"pool": name, "state": state}, stats[state])
+            for state in ("size", "checked_out", "checked_in", "overflow") if state in stats
+        ]
+        pool = manager.engine.pool if manager.engine is not None else None
+        wait_time = getattr(pool, "wait_time", None)
+        if wait_time is not None:
+            wait_lines += render_histogram("db_pool_wait_seconds", {"pool": name}, wait_time)
+
+    lines = render_gauges("db_pool_connections", "Соединения пула по состояниям", samples)
+    if wait_lines:
+        lines += ["# HELP db_pool_wait_seconds Время ожидания соединения из пула",
+                  "# TYPE db_pool_wait_seconds histogram"] + wait_lines
+    return lines
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Отдаёт метрики приложения в текстовом формате Prometheus."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
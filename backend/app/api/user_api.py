@@ -1,19 +1,22 @@
 from datetime import timedelta
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from starlette import status
 
-from backend.app.dependencies.auth_dep import CurrentUser
+from backend.app.dependencies.auth_dep import CurrentUser, CurrentPrincipal
 from backend.app.dependencies.services import registration_service, user_auth, user_service
 from backend.app.models.schemas import Token, Msg
 from backend.app.models.user import UserRead, UserCreate, UserAccountRead, UserUpdate
+from backend.app.models.user_balance_summary import UserSummaryPage, UserListFilter, UserListQuery
 
 from backend.core import security
 from backend.core.config import settings
 
-from backend.core.db import TransactionSessionDep, SessionDep
+from backend.core.db import TransactionSessionDep, SessionDep, ReadSessionDep
+from backend.core.responses import FastJSONResponse
 
 user_router = APIRouter()
 
@@ -26,9 +29,10 @@ async def login_access_token(db: SessionDep, form_data: Annotated[OAuth2Password
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    claims = {"su": user.is_superuser} if settings.JWT_SUPERUSER_CLAIM else None
     return Token(
         access_token=security.create_access_token(
-            str(user.id), expires_delta=access_token_expires
+            str(user.id), expires_delta=access_token_expires, claims=claims
         ), token_type="bearer"
     )
 
@@ -48,7 +52,7 @@ async def user_create(schema: UserCreate, db: TransactionSessionDep, current_use
 
 
 @user_router.get('/me', response_model=UserAccountRead)
-async def get_user_me(db:SessionDep, current_user: CurrentUser):
+async def get_user_me(db: ReadSessionDep, current_user: CurrentPrincipal):
     """
        Получение информации о текущем авторизованном пользователе.
 
@@ -56,6 +60,8 @@ async def get_user_me(db:SessionDep, current_user: CurrentUser):
        :param current_user: Текущий авторизованный пользователь
        :return: Публичные данные пользователя
        """
+    if settings.FAST_SERIALIZATION:
+        return FastJSONResponse(await user_service.get_user_me_data(db=db, current_user=current_user))
     return await user_service.get_user_me(db=db, current_user=current_user)
 
 
@@ -92,16 +98,42 @@ async def delete_user(user_id: int, db: TransactionSessionDep, current_user: Cur
     return await user_service.delete_user(db=db, current_user=current_user, user_id=user_id)
 
 
-@user_router.get("/all_user", response_model=List[UserAccountRead])
-async def get_all_user(db: SessionDep, current_user: CurrentUser):
+@user_router.get("/all_user", response_model=UserSummaryPage)
+async def get_all_user(
+        db: ReadSessionDep,
+        current_user: CurrentPrincipal,
+        params: Annotated[UserListQuery, Query()],
+):
     """
-        Возвращает список всех пользователей системы.
+        Возвращает страницу пользователей системы со сводкой по счетам.
 
         Доступ разрешён только администраторам.
 
         :param db: Асинхронная сессия базы данных.
         :param current_user: Текущий авторизованный пользователь.
-        :return: Список пользователей.
+        :param params: Фильтры (префикс email, признак суперпользователя, период регистрации), сортировка,
+            размер страницы и курсор next_cursor из предыдущей страницы.
+        :return: Страница пользователей со сводкой и курсор следующей страницы.
 
         """
-    return await user_service.get_users(db=db, current_user=current_user)
+    if settings.FAST_SERIALIZATION:
+        return FastJSONResponse(await user_service.get_users_data(db=db, current_user=current_user, params=params,
+                                                                  limit=params.limit, cursor=params.cursor))
+    return await user_service.get_users(db=db, current_user=current_user, params=params, limit=params.limit,
+                                        cursor=params.cursor)
+
+
+@user_router.get("/all_user/export")
+async def export_all_user(current_user: CurrentPrincipal, params: Annotated[UserListFilter, Query()]):
+    """
+        Потоково выгружает пользователей системы со сводкой по счетам в формате NDJSON.
+
+        Доступ разрешён только администраторам.
+
+        :param current_user: Текущий авторизованный пользователь.
+        :param params: Фильтры и сортировка, как у /all_user.
+        :return: Потоковый ответ, по одному пользователю в строке.
+
+        """
+    user_service.verify_list_access(current_user)
+    return StreamingResponse(user_service.export_users(params), media_type="application/x-ndjson")
@@ -1,20 +1,77 @@
-from fastapi import APIRouter
-from backend.app.dependencies.services import payment_service
-from backend.app.models.schemas import WebhookRequest
-from backend.core.db import TransactionSessionDep
+from typing import List
+
+from fastapi import APIRouter, Request, Response, status
+from backend.app.dependencies.auth_dep import CurrentPrincipal
+from backend.app.dependencies.services import payment_service, webhook_queue
+from backend.app.models.schemas import WebhookRequest, WebhookBatchResponse
+from backend.app.models.webhook_inbox import WebhookStatusRead
+from backend.app.services.helpers import parse_webhook_body
+from backend.core.config import settings
+from backend.core.db import TransactionSessionDep, SessionDep
 
 webhook_router = APIRouter()
 
 
-@webhook_router.post("/process-payment-webhook")
+@webhook_router.post(
+    "/process-payment-webhook",
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": WebhookRequest.model_json_schema()}},
+    }},
+)
 async def process_payment_webhook(
-        webhook_data: WebhookRequest,
-        db: TransactionSessionDep
+        request: Request,
+        db: TransactionSessionDep,
+        response: Response
 ) -> dict:
     """
     Обрабатывает входящий вебхук от платёжной системы.
-    :param webhook_data: Данные, полученные от платёжной системы.
+
+    Тело запроса разбирается вручную: подпись проверяется до построения модели,
+    поэтому поддельные запросы отклоняются без валидации Pydantic и обращения к БД.
+    При включённом WEBHOOK_ASYNC_MODE вебхук только записывается в inbox и подтверждается
+    ответом 202, а платёж применяется фоновыми воркерами.
+
+    :param request: Запрос с телом вебхука (WebhookRequest).
+    :param db: Асинхронная транзакционная сессия базы данных.
+    :param response: Ответ, для которого выставляется статус 202 в асинхронном режиме.
+    :return: dict: Статус обработки и новый баланс счёта (или статус приёма в асинхронном режиме).
+    """
+    webhook_data = parse_webhook_body(await request.body())
+    if settings.WEBHOOK_ASYNC_MODE:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await webhook_queue.enqueue(db, webhook_data, signature_verified=True)
+    return await payment_service.process_payment(db, webhook_data, signature_verified=True)
+
+
+@webhook_router.get("/status/{transaction_id}", response_model=WebhookStatusRead)
+async def get_webhook_status(transaction_id: str, db: SessionDep, principal: CurrentPrincipal):
+    """
+    Возвращает состояние обработки вебхука, принятого в асинхронном режиме.
+
+    Доступно владельцу платежа и администратору.
+
+    :param transaction_id: ID транзакции платёжной системы.
+    :param db: Асинхронная сессия базы данных.
+    :param principal: Текущий пользователь.
+    :return: Статус обработки вебхука.
+    """
+    return await webhook_queue.get_status(db, transaction_id, principal)
+
+
+@webhook_router.post("/process-payment-webhook/batch", response_model=WebhookBatchResponse)
+async def process_payment_webhook_batch(
+        webhook_batch: List[WebhookRequest],
+        db: TransactionSessionDep
+) -> WebhookBatchResponse:
+    """
+    Обрабатывает пакет вебхуков от платёжной системы (сверка, повторная доставка после сбоя).
+
+    Дубликаты, неверные подписи и чужие счета не прерывают обработку пакета,
+    а возвращаются как статус соответствующего элемента.
+
+    :param webhook_batch: Список вебхуков, полученных от платёжной системы.
     :param db: Асинхронная транзакционная сессия базы данных.
-    :return: dict: Статус обработки и новый баланс счёта.
+    :return: Результаты обработки каждого вебхука в исходном порядке.
     """
-    return await payment_service.process_payment(db, webhook_data)
+    return WebhookBatchResponse(results=await payment_service.process_batch(db, webhook_batch))
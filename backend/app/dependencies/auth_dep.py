@@ -2,7 +2,8 @@ from typing import Annotated
 import jwt
 from fastapi import Depends, HTTPException
 from backend.app.dependencies.repositories import user_repo
-from backend.app.models.schemas import TokenPayload
+from backend.app.dependencies.services import user_cache
+from backend.app.models.schemas import TokenPayload, Principal
 from backend.app.models.user import User
 
 from backend.core.config import settings
@@ -10,21 +11,46 @@ from backend.core.db import SessionDep
 from backend.core.security import TokenDep
 
 
-async def get_current_user(db: SessionDep, token: TokenDep) -> User:
+def decode_token(token: str) -> TokenPayload:
     if not token:
         raise HTTPException(status_code=403, detail="Token not provided")
 
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=403, detail="Token expired")
     except jwt.InvalidTokenError as e:
         print(f"Invalid token: {e}")
         raise HTTPException(status_code=403, detail="Invalid token")
 
-    user = await user_repo.get_or_404(db=db, id=int(token_data.sub))
+
+async def load_user(db, user_id: int) -> User:
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await user_repo.get_or_404(db=db, id=user_id)
+        user_cache.set(user)
     return user
 
 
+async def get_current_user(db: SessionDep, token: TokenDep) -> User:
+    token_data = decode_token(token)
+    return await load_user(db, int(token_data.sub))
+
+
+async def get_current_principal(db: SessionDep, token: TokenDep) -> Principal:
+    """
+    Возвращает id и права текущего пользователя.
+
+    Если включён JWT_SUPERUSER_CLAIM и токен содержит признак суперпользователя,
+    обращение к кэшу и БД не выполняется.
+    """
+    token_data = decode_token(token)
+    if settings.JWT_SUPERUSER_CLAIM and token_data.su is not None:
+        return Principal(id=int(token_data.sub), is_superuser=token_data.su)
+    user = await load_user(db, int(token_data.sub))
+    return Principal(id=user.id, is_superuser=user.is_superuser)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
@@ -1,7 +1,11 @@
 from backend.app.repositories.account_repositories import AccountRepository
 from backend.app.repositories.payment_repositiry import PaymentRepository
+from backend.app.repositories.user_balance_summary_repository import UserBalanceSummaryRepository
 from backend.app.repositories.user_repositories import UserRepository
+from backend.app.repositories.webhook_inbox_repository import WebhookInboxRepository
 
 user_repo = UserRepository()
 account_repo = AccountRepository()
 payment_repo = PaymentRepository()
+webhook_inbox_repo = WebhookInboxRepository()
+user_summary_repo = UserBalanceSummaryRepository()
@@ -1,25 +1,55 @@
-from backend.app.dependencies.repositories import user_repo, account_repo, payment_repo
+from backend.app.dependencies.repositories import user_repo, account_repo, payment_repo, webhook_inbox_repo, \
+    user_summary_repo
 from backend.app.services.account.account_service import AccountService
 
 from backend.app.services.auth.authentication import UserAuthentication
 from backend.app.services.auth.password_service import PasswordService
 from backend.app.services.auth.permission import PermissionService
 from backend.app.services.auth.registration_service import RegistrationService
+from backend.app.services.auth.user_cache import UserCache
 from backend.app.services.auth.user_service import UserService
+from backend.app.services.payment.credit_coalescer import AccountCreditCoalescer
 from backend.app.services.payment.payment_service import PaymentService
+from backend.app.services.payment.webhook_queue import WebhookQueueService
+from backend.core.config import settings
+from backend.core.db import session_manager, read_session_manager
 
-password_service = PasswordService()
+password_service = PasswordService(max_workers=settings.PASSWORD_HASH_WORKERS,
+                                   max_queue=settings.PASSWORD_HASH_MAX_QUEUE)
 permission_service = PermissionService()
+user_cache = UserCache(ttl=settings.USER_CACHE_TTL_SECONDS, max_size=settings.USER_CACHE_MAX_SIZE)
 
 user_auth = UserAuthentication(password_service, user_repo)
 registration_service = RegistrationService(user_repo, password_service, permission_service)
-user_service = UserService(user_repo, permission_service, password_service)
+user_service = UserService(user_repo, permission_service, password_service, user_cache, user_summary_repo,
+                           account_repo, read_session_manager)
 
-account_service = AccountService(account_repo, permission_service)
+account_service = AccountService(account_repo, permission_service, payment_repo, read_session_manager,
+                                 user_summary_repo)
+credit_coalescer = AccountCreditCoalescer(
+    payment_repo,
+    account_repo,
+    user_summary_repo,
+    session_manager,
+    window=settings.PAYMENT_COALESCE_WINDOW_MS / 1000,
+    max_batch=settings.WEBHOOK_BATCH_MAX_SIZE,
+) if settings.PAYMENT_COALESCE_WINDOW_MS > 0 else None
 payment_service = PaymentService(
     payment_repo,
     account_repo,
     user_repo,
     permission_service,
-    account_service
+    account_service,
+    user_summary_repo,
+    coalescer=credit_coalescer
+)
+webhook_queue = WebhookQueueService(
+    webhook_inbox_repo,
+    payment_service,
+    session_manager,
+    concurrency=settings.WEBHOOK_WORKER_CONCURRENCY,
+    batch_size=settings.WEBHOOK_WORKER_BATCH_SIZE,
+    poll_interval=settings.WEBHOOK_WORKER_POLL_INTERVAL,
+    max_pending=settings.WEBHOOK_INBOX_MAX_PENDING,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
 )
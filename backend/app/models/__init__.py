@@ -1,9 +1,12 @@
 __all__ = ('User',
            'Account',
-           'Payment'
+           'Payment',
+           'WebhookInbox',
+           'UserBalanceSummary'
            )
 
 from backend.app.models.payment import Payment
 from backend.app.models.user import User
 from backend.app.models.account import Account
-
+from backend.app.models.webhook_inbox import WebhookInbox
+from backend.app.models.user_balance_summary import UserBalanceSummary
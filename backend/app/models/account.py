@@ -12,7 +12,7 @@ class Account(SQLModel, table=True):
     __tablename__ = 'account'
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     account_number: str = Field(unique=True, index=True)
-    user_id: int = Field(foreign_key="user.id", description="ID связанного пользователя")
+    user_id: int = Field(foreign_key="user.id", index=True, description="ID связанного пользователя")
     balance: Decimal = Field(
         default=Decimal('0.00'),
         sa_column=Column(Numeric(precision=10, scale=2))
@@ -1,15 +1,27 @@
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, Index, func
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class Payment(SQLModel, table=True):
     __tablename__ = 'payment'
+    # Выписка по счёту: фильтр по account_id и сортировка по (created_at, id)
+    __table_args__ = (
+        Index('ix_payment_account_id_created_at', 'account_id', 'created_at', 'id'),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    transaction_id: str
+    transaction_id: str = Field(unique=True, index=True)
     amount: int
     account_id: int = Field(foreign_key="account.id")
+    # Время записи платежа, по нему строится постраничная выписка
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    )
 
     # Связь многие-к-одному с Account
     account: "Account" = Relationship(back_populates="payments")
@@ -29,3 +41,9 @@ class PaymentRead(BaseModel):
     id: UUID
     transaction_id: str
     amount: float
+    created_at: Optional[datetime] = None
+
+
+class PaymentStatementPage(BaseModel):
+    items: List[PaymentRead]
+    next_cursor: Optional[str] = None
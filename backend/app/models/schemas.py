@@ -1,5 +1,9 @@
+from decimal import Decimal
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -11,6 +15,13 @@ class Msg(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: str
+    su: Optional[bool] = None  # Признак суперпользователя, если JWT_SUPERUSER_CLAIM включён
+
+
+class Principal(BaseModel):
+    """Минимальные данные текущего пользователя для проверки прав доступа."""
+    id: int
+    is_superuser: bool
 
 
 class WebhookRequest(BaseModel):
@@ -21,16 +32,11 @@ class WebhookRequest(BaseModel):
     signature: str
 
 
+class WebhookResult(BaseModel):
+    transaction_id: str
+    status: str
+    new_balance: Optional[Decimal] = None
 
 
-
-
-
-
-
-
-
-
-
-
-
+class WebhookBatchResponse(BaseModel):
+    results: List[WebhookResult]
@@ -1,4 +1,7 @@
+from datetime import datetime
+
 from pydantic import BaseModel, computed_field
+from sqlalchemy import Column, DateTime, func
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 
@@ -15,6 +18,11 @@ class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     is_superuser: bool = Field(default=False)
     hashed_password: str
+    # Время регистрации, по нему фильтруется список пользователей в админке
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    )
 
     # Связь один-ко-многим с Account
     accounts: List["Account"] = Relationship(
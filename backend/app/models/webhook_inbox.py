@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field
+
+
+class WebhookInbox(SQLModel, table=True):
+    __tablename__ = 'webhook_inbox'
+    # Частичный индекс: воркеры выбирают только необработанные записи
+    __table_args__ = (
+        Index('ix_webhook_inbox_pending', 'id', postgresql_where=text("status = 'pending'")),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    transaction_id: str = Field(unique=True, index=True)
+    payload: dict = Field(sa_column=Column(JSONB, nullable=False))
+    # pending до обработки, затем статус результата из PaymentService.process_batch
+    # или failed, если применить вебхук не удалось за WEBHOOK_MAX_ATTEMPTS попыток
+    status: str = Field(default="pending")
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    )
+    processed_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+
+
+class WebhookStatusRead(BaseModel):
+    transaction_id: str
+    status: str
+    created_at: datetime
+    processed_at: Optional[datetime] = None
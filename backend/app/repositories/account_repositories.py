@@ -1,3 +1,9 @@
+from decimal import Decimal
+from typing import Optional, Dict, List, Iterable
+
+from sqlalchemy import update, func, case, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.models.account import Account, AccountCreate, AccountUpdate
 
@@ -20,3 +26,86 @@ class AccountRepository(AsyncBaseRepository[Account, AccountCreate, AccountUpdat
         """
         super().__init__(Account)
 
+    async def get_row(self, db: AsyncSession, account_id: int) -> Optional[Row]:
+        """
+        Возвращает счёт без создания ORM-объекта.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :return: Строка (id, account_number, balance, user_id) или None, если счёт не найден.
+        """
+        return await self.get_columns(
+            db, (Account.id, Account.account_number, Account.balance, Account.user_id), id=account_id
+        )
+
+    async def get_rows_by_user(self, db: AsyncSession, user_id: int) -> List[Row]:
+        """
+        Возвращает счета пользователя без создания ORM-объектов.
+
+        :param db: Асинхронная сессия базы данных.
+        :param user_id: ID владельца счетов.
+        :return: Строки (id, account_number, balance).
+        """
+        return await self.project(db, (Account.id, Account.account_number, Account.balance),
+                                  Account.user_id == user_id)
+
+    async def lock_for_credit(self, db: AsyncSession, account_ids: Iterable[int]) -> List[Row]:
+        """
+        Блокирует счета пакета в порядке id и возвращает их владельцев.
+
+        Все пути зачисления блокируют сначала счета, затем сводки пользователей; единый порядок id
+        внутри пакета исключает взаимные блокировки параллельных пакетов.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param account_ids: ID счетов.
+        :return: Строки (id, user_id) найденных счетов.
+        """
+        result = await db.execute(
+            select(Account.id, Account.user_id)
+            .where(Account.id.in_(set(account_ids)))
+            .order_by(Account.id)
+            .with_for_update()
+        )
+        return list(result.all())
+
+    async def credit_balance(self, db: AsyncSession, account_id: int, amount: Decimal) -> Optional[Decimal]:
+        """
+        Атомарно зачисляет сумму на баланс счёта одним запросом.
+
+        Выполняет ``UPDATE account SET balance = balance + :amount ... RETURNING balance``,
+        поэтому параллельные зачисления на один счёт не теряют обновлений.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :param amount: Сумма зачисления.
+        :return: Новый баланс счёта или None, если счёт не найден.
+        """
+        query = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(balance=func.coalesce(Account.balance, 0) + amount)
+            .returning(Account.balance)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def credit_balances(self, db: AsyncSession, deltas: Dict[int, Decimal]) -> Dict[int, Decimal]:
+        """
+        Атомарно зачисляет суммы на несколько счетов одним запросом.
+
+        :param db: Асинхронная сессия базы данных.
+        :param deltas: Суммы зачисления по ID счетов.
+        :return: Новые балансы по ID счетов.
+        """
+        if not deltas:
+            return {}
+        query = (
+            update(Account)
+            .where(Account.id.in_(deltas.keys()))
+            .values(balance=func.coalesce(Account.balance, 0) + case(deltas, value=Account.id))
+            .returning(Account.id, Account.balance)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        return {account_id: balance for account_id, balance in result.all()}
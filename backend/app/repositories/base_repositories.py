@@ -1,13 +1,43 @@
 import logging
-from typing import Optional, Sequence, Tuple, Any
+from typing import Optional, Sequence, Tuple, Any, List, Iterable, Set, Dict
+from sqlalchemy import insert, update, delete, func, bindparam, inspect
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
 from backend.app.abstractions.repository import IQueryRepository, ModelType, ICrudRepository, CreateType, UpdateType
+from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Готовые выражения поиска по (модель, вид запроса, имена полей фильтра)
+_lookup_statements: Dict[Tuple[type, str, Tuple[str, ...]], Any] = {}
+
+
+def lookup_statement(model: type, kind: str, keys: Tuple[str, ...]):
+    """
+    Возвращает заранее построенное выражение поиска по равенству полей с параметрами bindparam.
+
+    Выражение строится один раз на форму поиска (например, User по email или Payment по transaction_id)
+    и переиспользуется с разными значениями: SQLAlchemy не собирает select заново и берёт
+    скомпилированный SQL из кэша по запомненному ключу выражения.
+
+    :param model: Модель, по которой выполняется поиск.
+    :param kind: ``select`` - выборка объектов, ``exists`` - SELECT EXISTS(...).
+    :param keys: Имена полей фильтра в порядке сортировки.
+
+    Значения подставляются параметрами, поэтому сравнение с None не превращается в IS NULL -
+    такие условия передавайте в base_filter.
+    """
+    cache_key = (model, kind, keys)
+    statement = _lookup_statements.get(cache_key)
+    if statement is None:
+        query = select(model).where(*(getattr(model, key) == bindparam(key) for key in keys))
+        statement = select(query.exists()) if kind == "exists" else query
+        _lookup_statements[cache_key] = statement
+    return statement
+
 
 # Миксин для дополнительных операций
 class QueryMixin(IQueryRepository[ModelType]):
@@ -15,10 +45,10 @@ class QueryMixin(IQueryRepository[ModelType]):
         self.model = model
 
     async def get_or_404(self, db: AsyncSession, id: int, options: Optional[list[Any]] = None):
-        query = select(self.model).where(id == self.model.id)
+        query = lookup_statement(self.model, "select", ("id",))
         if options:
             query = query.options(*options)
-        result = await db.execute(query)
+        result = await db.execute(query, {"id": id})
         instance = result.scalar_one_or_none()  # Возвращает первый результат (или None)
 
         if not instance:
@@ -30,9 +60,31 @@ class QueryMixin(IQueryRepository[ModelType]):
     async def exist(self, db: AsyncSession, **kwargs) -> bool:
         """
         Проверяет, существует ли запись, соответствующая заданным фильтрам.
+        Выполняется как SELECT EXISTS(...) без загрузки объекта.
+        """
+        return await db.scalar(lookup_statement(self.model, "exists", tuple(sorted(kwargs))), kwargs)
+
+    async def count(self, db: AsyncSession, *filters) -> int:
+        """
+        Возвращает количество записей, соответствующих фильтрам.
+        Пример: await count(db, Account.user_id == user_id)
+        """
+        return await db.scalar(select(func.count()).select_from(self.model).where(*filters))
+
+    async def exists_many(self, db: AsyncSession, column, values: Iterable[Any]) -> Set[Any]:
         """
-        result = await db.execute(select(self.model).filter_by(**kwargs))
-        return result.scalar() is not None
+        Проверяет пакет ключей одним запросом на каждые BULK_CHUNK_SIZE значений.
+        Пример: await exists_many(db, Payment.transaction_id, transaction_ids)
+
+        :return: Подмножество values, для которых запись существует.
+        """
+        values = list(set(values))
+        size = settings.BULK_CHUNK_SIZE
+        found = set()
+        for start in range(0, len(values), size):
+            result = await db.scalars(select(column).where(column.in_(values[start:start + size])))
+            found.update(result.all())
+        return found
 
     async def base_filter(self, db: AsyncSession, *filters, options=None):
         """
@@ -48,21 +100,70 @@ class QueryMixin(IQueryRepository[ModelType]):
         return result.scalars().all()
 
 
+    async def project(self, db: AsyncSession, columns: Sequence[Any], *filters, order_by=None,
+                      limit: Optional[int] = None) -> List[Row]:
+        """
+        Выбирает только указанные колонки без создания ORM-объектов.
+        Пример: await project(db, (Account.id, Account.user_id), Account.id.in_(ids))
+
+        Строки Row - именованные кортежи: не попадают в identity map сессии
+        и не отслеживаются при flush.
+        """
+        query = select(*columns).select_from(self.model).where(*filters)
+        if order_by is not None:
+            query = query.order_by(*order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return list(result.all())
+
+
 class AsyncBaseRepository(ICrudRepository[ModelType, CreateType, UpdateType]):
     def __init__(self, model: type[ModelType]):
         self.model = model
 
     @staticmethod
-    async def save_db(db: AsyncSession, db_obj: ModelType) -> ModelType:
-        """Сохраняет объект в базе данных"""
-        merged_obj = await db.merge(db_obj)
+    async def insert(db: AsyncSession, db_obj: ModelType, refresh: bool = False) -> ModelType:
+        """
+        Добавляет новый объект в сессию и выполняет INSERT.
+
+        Первичный ключ и серверные значения по умолчанию возвращаются тем же INSERT
+        через RETURNING (eager_defaults="auto"), поэтому повторное чтение строки не требуется.
+
+        :param db: Асинхронная сессия базы данных.
+        :param db_obj: Новый объект модели.
+        :param refresh: Перечитать объект из базы после вставки (например, для значений триггеров).
+        :return: Тот же объект, привязанный к сессии.
+        """
+        db.add(db_obj)
         await db.flush()
-        await db.refresh(merged_obj)
-        return merged_obj
+        if refresh:
+            await db.refresh(db_obj)
+        return db_obj
+
+    @staticmethod
+    async def persist(db: AsyncSession, db_obj: ModelType, merge: bool = False, refresh: bool = False) -> ModelType:
+        """
+        Сохраняет изменения объекта одним flush.
+
+        :param db: Асинхронная сессия базы данных.
+        :param db_obj: Объект модели, загруженный в этой сессии или новый.
+        :param merge: Объединить объект с сессией (нужно для объектов из другой сессии).
+        :param refresh: Перечитать объект из базы после сохранения.
+        :return: Сохранённый объект, привязанный к сессии.
+        """
+        if merge:
+            db_obj = await db.merge(db_obj)
+        else:
+            db.add(db_obj)
+        await db.flush()
+        if refresh:
+            await db.refresh(db_obj)
+        return db_obj
 
     async def create(self, db: AsyncSession, schema: CreateType, **kwargs) -> ModelType:
         db_obj = self.model(**schema.model_dump(exclude_unset=True), **kwargs)
-        return await self.save_db(db, db_obj)
+        return await self.insert(db, db_obj)
 
     async def update(self, db: AsyncSession, model: ModelType, schema: UpdateType | dict) -> ModelType:
         """
@@ -71,12 +172,72 @@ class AsyncBaseRepository(ICrudRepository[ModelType, CreateType, UpdateType]):
         obj_data = schema if isinstance(schema, dict) else schema.model_dump(exclude_none=True)
         for key, value in obj_data.items():
             setattr(model, key, value)
-        return await self.save_db(db, model)
+        return await self.persist(db, model)
+
+    def _chunks(self, items: Sequence) -> List[Sequence]:
+        size = settings.BULK_CHUNK_SIZE
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    def _to_row(self, item: CreateType | dict, **kwargs) -> dict:
+        data = item if isinstance(item, dict) else item.model_dump(exclude_unset=True)
+        # Через модель, чтобы применились значения по умолчанию (default_factory) и лишние поля отбросились;
+        # None не передаём - такие колонки получат серверные значения по умолчанию
+        return self.model(**data, **kwargs).model_dump(exclude_none=True)
+
+    async def bulk_create(self, db: AsyncSession, items: Sequence[CreateType | dict], **kwargs) -> List[ModelType]:
+        """
+        Создаёт объекты пакетами по BULK_CHUNK_SIZE строк.
+
+        Каждый пакет - один INSERT ... RETURNING (insertmanyvalues), созданные объекты
+        сразу попадают в сессию с первичными ключами и серверными значениями по умолчанию.
+        Postgres не гарантирует порядок строк RETURNING у многострочного INSERT, поэтому
+        SQLAlchemy сопоставляет их с входными данными (sort_by_parameter_order).
+        """
+        rows = [self._to_row(item, **kwargs) for item in items]
+        created = []
+        for chunk in self._chunks(rows):
+            result = await db.scalars(insert(self.model).returning(self.model, sort_by_parameter_order=True), chunk)
+            created.extend(result.all())
+        return created
+
+    async def bulk_update(self, db: AsyncSession, values: Sequence[dict]) -> int:
+        """
+        Обновляет объекты по первичному ключу пакетами по BULK_CHUNK_SIZE строк (executemany).
+
+        Каждый словарь должен содержать первичный ключ; каскады и события ORM не выполняются.
+        """
+        for chunk in self._chunks(list(values)):
+            await db.execute(update(self.model), chunk)
+        return len(values)
+
+    async def bulk_delete(self, db: AsyncSession, ids: Sequence[Any]) -> int:
+        """
+        Удаляет объекты по первичному ключу пакетами по BULK_CHUNK_SIZE идентификаторов.
+
+        Каскады ORM не выполняются: зависимые строки должны быть удалены заранее.
+        Поддерживаются модели с первичным ключом из одной колонки (id, user_id и т.п.).
+        """
+        primary_key, = inspect(self.model).primary_key
+        deleted = 0
+        for chunk in self._chunks(list(ids)):
+            result = await db.execute(
+                delete(self.model).where(primary_key.in_(chunk)).returning(primary_key)
+            )
+            deleted += len(result.all())
+        return deleted
+
+    async def get_columns(self, db: AsyncSession, columns: Sequence[Any], **kwargs) -> Optional[Row]:
+        """
+        Получение указанных колонок одной записи по параметрам без создания ORM-объекта.
+        Пример: await get_columns(db, (User.id, User.hashed_password), email=email)
+        """
+        result = await db.execute(select(*columns).select_from(self.model).filter_by(**kwargs))
+        return result.one_or_none()
 
     async def get(self, db: AsyncSession, **kwargs) -> Optional[ModelType]:
         """Получение объекта по параметрам"""
         try:
-            result = await db.execute(select(self.model).filter_by(**kwargs))
+            result = await db.execute(lookup_statement(self.model, "select", tuple(sorted(kwargs))), kwargs)
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
             logger.error(f"Ошибка: {e}")
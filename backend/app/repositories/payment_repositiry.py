@@ -1,3 +1,12 @@
+from datetime import datetime
+from typing import Optional, Sequence, Set, List, Tuple, AsyncIterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from backend.app.models.payment import Payment, PaymentCreate, PaymentUpdate
 from backend.app.repositories.base_repositories import AsyncBaseRepository, QueryMixin
 
@@ -16,3 +25,112 @@ class PaymentRepository(AsyncBaseRepository[Payment, PaymentCreate, PaymentUpdat
         Вызывает конструктор базового класса для настройки сессий работы с данными.
         """
         super().__init__(Payment)
+
+    async def create_if_absent(self, db: AsyncSession, schema: PaymentCreate) -> Optional[UUID]:
+        """
+        Создаёт платёж, если транзакция с таким transaction_id ещё не записана.
+
+        Выполняет ``INSERT ... ON CONFLICT (transaction_id) DO NOTHING RETURNING id``:
+        дубликат определяется уникальным индексом без отдельного SELECT и без гонок
+        при повторной доставке вебхука.
+
+        :param db: Асинхронная сессия базы данных.
+        :param schema: Данные платежа.
+        :return: ID созданного платежа или None, если транзакция уже существует.
+        """
+        query = (
+            insert(Payment)
+            .values(id=uuid4(), **schema.model_dump())
+            .on_conflict_do_nothing(index_elements=[Payment.transaction_id])
+            .returning(Payment.id)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def create_many_if_absent(self, db: AsyncSession, schemas: Sequence[PaymentCreate]) -> Set[str]:
+        """
+        Создаёт пакет платежей одним запросом, пропуская уже записанные транзакции.
+
+        :param db: Асинхронная сессия базы данных.
+        :param schemas: Данные платежей.
+        :return: Множество transaction_id, которые были записаны этим запросом.
+        """
+        if not schemas:
+            return set()
+        query = (
+            insert(Payment)
+            .values([{"id": uuid4(), **schema.model_dump()} for schema in schemas])
+            .on_conflict_do_nothing(index_elements=[Payment.transaction_id])
+            .returning(Payment.transaction_id)
+        )
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    async def get_statement_page(self, db: AsyncSession, account_id: int, limit: int,
+                                 after: Optional[Tuple[datetime, UUID]] = None) -> List[Payment]:
+        """
+        Возвращает страницу платежей счёта, от новых к старым, с keyset-пагинацией.
+
+        Вместо OFFSET страница продолжается строго после ключа (created_at, id) последнего
+        платежа предыдущей страницы, поэтому стоимость запроса не зависит от её номера.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :param limit: Максимальное количество платежей на странице.
+        :param after: Ключ (created_at, id), после которого начинается страница.
+        :return: Список платежей.
+        """
+        result = await db.execute(self._statement_query(select(Payment), account_id, limit, after))
+        return list(result.scalars().all())
+
+    async def get_statement_rows(self, db: AsyncSession, account_id: int, limit: int,
+                                 after: Optional[Tuple[datetime, UUID]] = None) -> List[Row]:
+        """
+        То же, что get_statement_page, но без создания ORM-объектов.
+
+        :return: Строки (id, transaction_id, amount, created_at).
+        """
+        query = select(Payment.id, Payment.transaction_id, Payment.amount, Payment.created_at)
+        result = await db.execute(self._statement_query(query, account_id, limit, after))
+        return list(result.all())
+
+    async def get_rows_by_account(self, db: AsyncSession, account_id: int) -> List[Row]:
+        """
+        Возвращает все платежи счёта без создания ORM-объектов.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :return: Строки (id, transaction_id, amount, created_at).
+        """
+        return await self.project(db, (Payment.id, Payment.transaction_id, Payment.amount, Payment.created_at),
+                                  Payment.account_id == account_id)
+
+    @staticmethod
+    def _statement_query(query, account_id: int, limit: int, after: Optional[Tuple[datetime, UUID]]):
+        query = query.where(Payment.account_id == account_id)
+        if after is not None:
+            query = query.where(tuple_(Payment.created_at, Payment.id) < tuple_(*after))
+        return query.order_by(Payment.created_at.desc(), Payment.id.desc()).limit(limit)
+
+    async def stream_statement(self, db: AsyncSession, account_id: int,
+                               chunk_size: int = 1000) -> AsyncIterator[Row]:
+        """
+        Потоково выдаёт все платежи счёта через серверный курсор.
+
+        Строки выбираются порциями по chunk_size без создания ORM-объектов,
+        поэтому потребление памяти не зависит от размера истории.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :param chunk_size: Размер порции, получаемой из курсора.
+        :return: Асинхронный итератор строк (id, transaction_id, amount, created_at).
+        """
+        query = (
+            select(Payment.id, Payment.transaction_id, Payment.amount, Payment.created_at)
+            .where(Payment.account_id == account_id)
+            .order_by(Payment.created_at.desc(), Payment.id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await db.stream(query)
+        async for row in result:
+            yield row
@@ -0,0 +1,180 @@
+import operator
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Row, and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models import User
+from backend.app.models.user_balance_summary import UserBalanceSummary
+from backend.app.repositories.base_repositories import AsyncBaseRepository, QueryMixin
+
+SUMMARY_SORT_COLUMNS = {
+    "id": UserBalanceSummary.user_id,
+    "account_count": UserBalanceSummary.account_count,
+    "total_balance": UserBalanceSummary.total_balance,
+    "last_payment_at": UserBalanceSummary.last_payment_at,
+}
+
+
+class UserBalanceSummaryRepository(AsyncBaseRepository[UserBalanceSummary, UserBalanceSummary, UserBalanceSummary],
+                                   QueryMixin):
+    """
+    Репозиторий сводки по счетам пользователей.
+
+    Строка сводки создаётся триггером при вставке пользователя, поэтому список пользователей
+    строится от user_balance_summary без внешнего соединения. Сводка обновляется upsert-запросами
+    в транзакции, создающей счёт или зачисляющей платёж, поэтому всегда согласована с таблицами
+    account и payment.
+    """
+
+    def __init__(self):
+        """
+        Инициализирует репозиторий для работы с моделью UserBalanceSummary.
+        Вызывает конструктор базового класса для настройки сессий работы с данными.
+        """
+        super().__init__(UserBalanceSummary)
+
+    async def add_account(self, db: AsyncSession, user_id: int) -> None:
+        """
+        Учитывает новый счёт пользователя.
+
+        :param db: Асинхронная сессия базы данных.
+        :param user_id: ID владельца счёта.
+        """
+        query = insert(UserBalanceSummary).values(user_id=user_id, account_count=1, total_balance=0)
+        await db.execute(query.on_conflict_do_update(
+            index_elements=[UserBalanceSummary.user_id],
+            set_={"account_count": UserBalanceSummary.account_count + 1},
+        ))
+
+    async def apply_credits(self, db: AsyncSession, deltas: Dict[int, Decimal],
+                            new_accounts: Optional[Dict[int, int]] = None) -> None:
+        """
+        Добавляет зачисления (и, для пакетов, новые счета) к сводкам пользователей одним запросом.
+
+        Время последнего платежа - время начала транзакции (now()), как и created_at платежа.
+        Строки обновляются в порядке user_id и одним запросом, чтобы параллельные пакеты
+        не блокировали друг друга взаимно.
+
+        :param db: Асинхронная сессия базы данных.
+        :param deltas: Суммы зачислений по ID пользователей.
+        :param new_accounts: Количество созданных счетов по ID пользователей.
+        """
+        new_accounts = new_accounts or {}
+        user_ids = sorted(deltas.keys() | new_accounts.keys())
+        if not user_ids:
+            return
+        query = insert(UserBalanceSummary).values([
+            {
+                "user_id": user_id,
+                "account_count": new_accounts.get(user_id, 0),
+                "total_balance": deltas.get(user_id, 0),
+                "last_payment_at": func.now() if user_id in deltas else None,
+            }
+            for user_id in user_ids
+        ])
+        await db.execute(query.on_conflict_do_update(
+            index_elements=[UserBalanceSummary.user_id],
+            set_={
+                "account_count": UserBalanceSummary.account_count + query.excluded.account_count,
+                "total_balance": UserBalanceSummary.total_balance + query.excluded.total_balance,
+                "last_payment_at": func.coalesce(query.excluded.last_payment_at,
+                                                 UserBalanceSummary.last_payment_at),
+            },
+        ))
+
+    @staticmethod
+    def user_filters(email_prefix: Optional[str] = None, is_superuser: Optional[bool] = None,
+                     created_from: Optional[datetime] = None, created_to: Optional[datetime] = None) -> list:
+        """
+        Собирает условия фильтрации списка пользователей.
+
+        :param email_prefix: Начало email (без учёта спецсимволов LIKE).
+        :param is_superuser: Признак суперпользователя; None - без фильтра.
+        :param created_from: Нижняя граница времени регистрации, включительно.
+        :param created_to: Верхняя граница времени регистрации, не включительно.
+        :return: Список условий для запроса.
+        """
+        filters = []
+        if email_prefix:
+            filters.append(User.email.startswith(email_prefix, autoescape=True))
+        if is_superuser is not None:
+            filters.append(User.is_superuser == is_superuser)
+        if created_from is not None:
+            filters.append(User.created_at >= created_from)
+        if created_to is not None:
+            filters.append(User.created_at < created_to)
+        return filters
+
+    @staticmethod
+    def _users_query(filters: list, sort_by: str, descending: bool):
+        column = SUMMARY_SORT_COLUMNS[sort_by]
+        tiebreaker = UserBalanceSummary.user_id
+        order = (column.desc(), tiebreaker.desc()) if descending else (column.asc(), tiebreaker.asc())
+        if column.expression.nullable:
+            # NULL последними в обоих направлениях; для NOT NULL колонок модификатор не добавляется,
+            # чтобы сортировка по убыванию шла обратным проходом по возрастающему индексу
+            order = (order[0].nulls_last(), order[1])
+        return (
+            select(User.id, User.email, User.first_name, User.last_name, User.is_superuser, User.created_at,
+                   UserBalanceSummary.account_count, UserBalanceSummary.total_balance,
+                   UserBalanceSummary.last_payment_at)
+            .join(User, User.id == UserBalanceSummary.user_id)
+            .where(*filters)
+            .order_by(*order)
+        )
+
+    @staticmethod
+    def _after(sort_by: str, descending: bool, value: Any, user_id: int):
+        """
+        Условие keyset-пагинации: строки после (value, user_id) в порядке сортировки.
+
+        NULL в last_payment_at сортируются последними в обоих направлениях.
+        """
+        column = SUMMARY_SORT_COLUMNS[sort_by]
+        tiebreaker = UserBalanceSummary.user_id
+        beyond = operator.lt if descending else operator.gt
+        if value is None:
+            return and_(column.is_(None), beyond(tiebreaker, user_id))
+        condition = or_(beyond(column, value), and_(column == value, beyond(tiebreaker, user_id)))
+        if column.expression.nullable:
+            condition = or_(condition, column.is_(None))
+        return condition
+
+    async def list_users(self, db: AsyncSession, filters: list, sort_by: str, descending: bool, limit: int,
+                         after: Optional[Tuple[Any, int]] = None) -> List[Row]:
+        """
+        Возвращает страницу пользователей со сводкой по счетам.
+
+        :param db: Асинхронная сессия базы данных.
+        :param filters: Условия из user_filters.
+        :param sort_by: Поле сортировки, ключ SUMMARY_SORT_COLUMNS.
+        :param descending: Сортировать по убыванию.
+        :param limit: Размер страницы.
+        :param after: Ключ (значение поля сортировки, user_id) последней строки предыдущей страницы.
+        :return: Строки с полями пользователя и сводки.
+        """
+        if after is not None:
+            filters = [*filters, self._after(sort_by, descending, *after)]
+        result = await db.execute(self._users_query(filters, sort_by, descending).limit(limit))
+        return result.all()
+
+    async def stream_users(self, db: AsyncSession, filters: list, sort_by: str, descending: bool,
+                           chunk_size: int = 1000) -> AsyncIterator[Row]:
+        """
+        Потоково выдаёт всех пользователей со сводкой через серверный курсор.
+
+        :param db: Асинхронная сессия базы данных.
+        :param filters: Условия из user_filters.
+        :param sort_by: Поле сортировки, ключ SUMMARY_SORT_COLUMNS.
+        :param descending: Сортировать по убыванию.
+        :param chunk_size: Размер порции, получаемой из курсора.
+        :return: Асинхронный итератор строк с полями пользователя и сводки.
+        """
+        query = self._users_query(filters, sort_by, descending).execution_options(yield_per=chunk_size)
+        result = await db.stream(query)
+        async for row in result:
+            yield row
@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Optional
 
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import SQLModel
 
@@ -37,6 +38,14 @@ class UserRepository(AsyncBaseRepository[User, UserCreate, UserUpdate], QueryMix
         """Получение пользователя по email."""
         return await self.get(db, email=email)
 
+    async def get_read_row(self, db: AsyncSession, user_id: int) -> Optional[Row]:
+        """Получение публичных полей пользователя (id, email, first_name, last_name) без ORM-объекта."""
+        return await self.get_columns(db, (User.id, User.email, User.first_name, User.last_name), id=user_id)
+
+    async def get_credentials(self, db: AsyncSession, email: str) -> Optional[Row]:
+        """Получение данных для входа (id, hashed_password, is_superuser) по email без ORM-объекта."""
+        return await self.get_columns(db, (User.id, User.hashed_password, User.is_superuser), email=email)
+
     async def delete_user(self, db: AsyncSession, user_id: int) -> tuple[bool, SQLModel | None | Any]:
         """Удаление пользователя"""
         return await super().remove(db=db, id=user_id)
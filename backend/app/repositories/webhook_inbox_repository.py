@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import List, Dict
+
+from sqlalchemy import select, update, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.webhook_inbox import WebhookInbox
+from backend.app.models.schemas import WebhookRequest
+from backend.app.repositories.base_repositories import AsyncBaseRepository, QueryMixin
+
+
+class WebhookInboxRepository(AsyncBaseRepository[WebhookInbox, WebhookRequest, WebhookRequest], QueryMixin):
+    """
+    Репозиторий для работы с inbox-таблицей входящих вебхуков.
+
+    Хранит принятые, но ещё не применённые вебхуки, которые разбирают фоновые воркеры.
+    """
+
+    def __init__(self):
+        """
+        Инициализирует репозиторий для работы с моделью WebhookInbox.
+        Вызывает конструктор базового класса для настройки сессий работы с данными.
+        """
+        super().__init__(WebhookInbox)
+
+    async def enqueue(self, db: AsyncSession, data: WebhookRequest) -> bool:
+        """
+        Записывает вебхук в inbox, если транзакция с таким transaction_id ещё не принята.
+
+        :param db: Асинхронная сессия базы данных.
+        :param data: Вебхук-запрос от платёжной системы.
+        :return: True, если вебхук записан, False для повторной доставки.
+        """
+        query = (
+            insert(WebhookInbox)
+            .values(transaction_id=data.transaction_id, payload=data.model_dump(), status="pending")
+            .on_conflict_do_nothing(index_elements=[WebhookInbox.transaction_id])
+            .returning(WebhookInbox.id)
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def claim_pending(self, db: AsyncSession, limit: int) -> List[WebhookInbox]:
+        """
+        Блокирует пакет необработанных вебхуков для текущей транзакции.
+
+        ``FOR UPDATE SKIP LOCKED`` позволяет нескольким воркерам (и процессам) разбирать
+        inbox параллельно, не получая одни и те же записи.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param limit: Максимальный размер пакета.
+        :return: Список заблокированных записей в порядке поступления.
+        """
+        query = (
+            select(WebhookInbox)
+            .where(WebhookInbox.status == "pending")
+            .order_by(WebhookInbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def mark_processed(self, db: AsyncSession, statuses: Dict[int, str], processed_at: datetime) -> None:
+        """
+        Записывает результаты обработки пакета.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param statuses: Статусы результатов по ID записей inbox.
+        :param processed_at: Время обработки пакета.
+        """
+        await self.bulk_update(db, [
+            {"id": entry_id, "status": entry_status, "processed_at": processed_at}
+            for entry_id, entry_status in statuses.items()
+        ])
+
+    async def record_failure(self, db: AsyncSession, entry_id: int, error: str, max_attempts: int,
+                             processed_at: datetime) -> bool:
+        """
+        Учитывает неудачную попытку применить вебхук.
+
+        Запись остаётся pending и будет выбрана повторно, пока число попыток не достигнет max_attempts;
+        после этого она получает статус failed и больше не выбирается воркерами.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param entry_id: ID записи inbox.
+        :param error: Описание ошибки.
+        :param max_attempts: Допустимое число попыток.
+        :param processed_at: Время попытки.
+        :return: True, если запись переведена в failed.
+        """
+        exhausted = WebhookInbox.attempts + 1 >= max_attempts
+        result = await db.execute(
+            update(WebhookInbox)
+            .where(WebhookInbox.id == entry_id)
+            .values(
+                attempts=WebhookInbox.attempts + 1,
+                last_error=error[:1000],
+                status=case((exhausted, "failed"), else_=WebhookInbox.status),
+                processed_at=case((exhausted, processed_at), else_=WebhookInbox.processed_at),
+            )
+            .returning(WebhookInbox.status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one() == "failed"
+
+    async def count_pending(self, db: AsyncSession) -> int:
+        """
+        Возвращает число необработанных вебхуков.
+
+        :param db: Асинхронная сессия базы данных.
+        :return: Количество записей со статусом pending.
+        """
+        return await self.count(db, WebhookInbox.status == "pending")
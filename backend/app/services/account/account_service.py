@@ -1,30 +1,51 @@
+import csv
+import io
+import json
 import uuid
 from decimal import Decimal
+from typing import Optional, AsyncIterator
+
+from fastapi import HTTPException
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.models import User
 from backend.app.models.account import Account
+from backend.app.models.payment import PaymentStatementPage, PaymentRead
 from backend.app.repositories.account_repositories import AccountRepository
+from backend.app.repositories.payment_repositiry import PaymentRepository
+from backend.app.repositories.user_balance_summary_repository import UserBalanceSummaryRepository
 from backend.app.services.auth.permission import PermissionService
+from backend.app.services.helpers import encode_cursor, decode_cursor
+from backend.core.db import DatabaseSessionManager
 
 
 class AccountService:
-    def __init__(self, account_repository: AccountRepository, permissions: PermissionService):
+    def __init__(self, account_repository: AccountRepository, permissions: PermissionService,
+                 payment_repository: PaymentRepository, session_manager: DatabaseSessionManager,
+                 summary_repository: UserBalanceSummaryRepository):
         """
         Сервис для управления счетами пользователей.
 
         :param account_repository: Репозиторий для работы с моделью Account.
         :param permissions: Сервис для проверки прав доступа.
+        :param payment_repository: Репозиторий для работы с платежами счёта.
+        :param session_manager: Менеджер сессий для потоковой выгрузки выписки.
+        :param summary_repository: Репозиторий сводки по счетам пользователей.
         """
         self.account_repository = account_repository
         self.permissions = permissions
+        self.payment_repository = payment_repository
+        self.session_manager = session_manager
+        self.summary_repository = summary_repository
 
-    async def create_account(self, db: AsyncSession, current_user: User) -> Account:
+    async def create_account(self, db: AsyncSession, current_user: User, update_summary: bool = True) -> Account:
         """
-        Создаёт новый счёт для указанного пользователя.
+        Создаёт новый счёт для указанного пользователя и учитывает его в сводке пользователя.
 
         :param db: Асинхронная транзакционная сессия базы данных.
-        :param current_user: Пользователь, для которого создаётся счёт.
+        :param current_user: Пользователь, для которого создаётся счёт (достаточно объекта с id).
+        :param update_summary: Учесть счёт в сводке сразу; пакетная обработка учитывает новые счета
+            вместе с зачислениями одним запросом.
         :return: Объект созданного счёта.
         """
         account_number = f"ACC-{uuid.uuid4().hex[:8].upper()}"  # Пример: "ACC-A1B2C3D4"
@@ -35,7 +56,9 @@ class AccountService:
             balance=Decimal('0.00')  # Начальный баланс
         )
 
-        account = await self.account_repository.save_db(db, account)
+        account = await self.account_repository.insert(db, account)
+        if update_summary:
+            await self.summary_repository.add_account(db, current_user.id)
         return account
 
     async def get_account(self, db: AsyncSession, account_id: int, current_user: User):
@@ -53,3 +76,116 @@ class AccountService:
         )
         self.permissions.verify_owner_account(account, current_user)
         return account
+
+    async def get_statement(self, db: AsyncSession, account_id: int, current_user: User, limit: int,
+                            cursor: Optional[str] = None) -> PaymentStatementPage:
+        """
+        Получает страницу выписки по счёту, от новых платежей к старым.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :param current_user: Текущий пользователь, для проверки прав доступа.
+        :param limit: Количество платежей на странице.
+        :param cursor: Курсор следующей страницы из предыдущего ответа.
+        :return: Страница платежей и курсор следующей страницы.
+        :raises HTTPException: Если пользователь не владелец счёта или курсор некорректен.
+        """
+        await self.verify_statement_access(db, account_id, current_user)
+
+        after = decode_cursor(cursor) if cursor else None
+        payments = await self.payment_repository.get_statement_page(db, account_id, limit + 1, after)
+        next_cursor = None
+        if len(payments) > limit:
+            payments = payments[:limit]
+            next_cursor = encode_cursor(payments[-1].created_at, payments[-1].id)
+        return PaymentStatementPage(
+            items=[PaymentRead.model_validate(payment, from_attributes=True) for payment in payments],
+            next_cursor=next_cursor
+        )
+
+    async def get_account_data(self, db: AsyncSession, account_id: int, current_user: User) -> dict:
+        """
+        Быстрый вариант get_account: счёт и платежи собираются из строк запросов без ORM-объектов.
+
+        :param db: Асинхронная сессия базы данных.
+        :param account_id: ID счёта.
+        :param current_user: Текущий пользователь, для проверки прав доступа.
+        :return: Данные счёта в формате AccountReadWithPayments, баланс - Decimal.
+        :raises HTTPException: Если счёт не найден или пользователь не владелец счёта.
+        """
+        account = await self._get_account_row(db, account_id, current_user)
+        payments = await self.payment_repository.get_rows_by_account(db, account_id)
+        return {
+            "id": account.id,
+            "account_number": account.account_number,
+            "balance": account.balance,
+            "payments": [payment._asdict() for payment in payments],
+        }
+
+    async def get_statement_data(self, db: AsyncSession, account_id: int, current_user: User, limit: int,
+                                 cursor: Optional[str] = None) -> dict:
+        """
+        Быстрый вариант get_statement: страница собирается из строк запроса без ORM-объектов
+        и валидации PaymentRead.
+
+        :return: Данные страницы в формате PaymentStatementPage.
+        :raises HTTPException: Если пользователь не владелец счёта или курсор некорректен.
+        """
+        await self._get_account_row(db, account_id, current_user)
+
+        after = decode_cursor(cursor) if cursor else None
+        payments = await self.payment_repository.get_statement_rows(db, account_id, limit + 1, after)
+        next_cursor = None
+        if len(payments) > limit:
+            payments = payments[:limit]
+            next_cursor = encode_cursor(payments[-1].created_at, payments[-1].id)
+        return {"items": [payment._asdict() for payment in payments], "next_cursor": next_cursor}
+
+    async def _get_account_row(self, db: AsyncSession, account_id: int, current_user: User):
+        account = await self.account_repository.get_row(db, account_id)
+        if account is None:
+            raise HTTPException(status_code=404, detail="Объект не найден")
+        self.permissions.verify_owner_account(account, current_user)
+        return account
+
+    async def verify_statement_access(self, db: AsyncSession, account_id: int, current_user: User) -> None:
+        """
+        Проверяет, что счёт существует и принадлежит пользователю.
+
+        :raises HTTPException: Если счёт не найден или пользователь не владелец счёта.
+        """
+        account = await self.account_repository.get_or_404(db, id=account_id)
+        self.permissions.verify_owner_account(account, current_user)
+
+    async def export_statement(self, account_id: int, export_format: str) -> AsyncIterator[str]:
+        """
+        Потоково формирует полную выписку по счёту в формате NDJSON или CSV.
+
+        Выгрузка читает платежи серверным курсором в собственной сессии, которая живёт
+        столько же, сколько отправка ответа. Права доступа проверяются заранее
+        через verify_statement_access.
+
+        :param account_id: ID счёта.
+        :param export_format: Формат выгрузки: ``ndjson`` или ``csv``.
+        :return: Асинхронный итератор фрагментов ответа.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(("id", "transaction_id", "amount", "created_at"))
+            yield buffer.getvalue()
+
+        async with self.session_manager.create_session() as db:
+            async for row in self.payment_repository.stream_statement(db, account_id):
+                if export_format == "csv":
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerow((row.id, row.transaction_id, row.amount, row.created_at.isoformat()))
+                    yield buffer.getvalue()
+                else:
+                    yield json.dumps({
+                        "id": str(row.id),
+                        "transaction_id": row.transaction_id,
+                        "amount": row.amount,
+                        "created_at": row.created_at.isoformat(),
+                    }) + "\n"
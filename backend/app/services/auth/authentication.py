@@ -1,7 +1,8 @@
 from typing import Optional
+
+from sqlalchemy.engine import Row
 from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.abstractions.services import IPasswordService
-from backend.app.models import User
 from backend.app.repositories.user_repositories import UserRepository
 
 
@@ -18,16 +19,19 @@ class UserAuthentication:
         self.pass_service = pass_service
         self.user_repository = user_repository
 
-    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[User]:
+    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[Row]:
         """
         Аутентифицирует пользователя по email и паролю.
 
+        Загружаются только колонки, нужные для входа, без создания объекта User.
+
         :param db: Асинхронная сессия базы данных.
         :param email: Электронная почта пользователя.
         :param password: Пароль пользователя.
-        :return: Optional[User]: Возвращает пользователя, если аутентификация прошла успешно, иначе None.
+        :return: Optional[Row]: Строка (id, hashed_password, is_superuser), если аутентификация прошла успешно,
+            иначе None.
         """
-        user = await self.user_repository.get_by_email(db, email=email)
-        if not user or not self.pass_service.verify_password(password, user.hashed_password):
+        user = await self.user_repository.get_credentials(db, email=email)
+        if not user or not await self.pass_service.verify_password_async(password, user.hashed_password):
             return None
         return user
@@ -1,10 +1,37 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
 from backend.app.abstractions.services import IPasswordService
+from backend.core.metrics import Histogram
 from backend.core.security import pwd_context
 
 
 class PasswordService(IPasswordService):
     """Сервис для хэширования и проверки паролей пользователей."""
 
+    def __init__(self, max_workers: int = 4, max_queue: int = 100):
+        """
+        Инициализирует сервис с отдельным пулом потоков для bcrypt.
+
+        bcrypt освобождает GIL, поэтому хэширование в пуле потоков не блокирует
+        цикл событий и обработку вебхуков на том же воркере.
+
+        :param max_workers: Максимальное число одновременных операций bcrypt.
+        :param max_queue: Максимальное число операций, ожидающих свободный поток.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.pending = 0  # В работе и в очереди
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.queue_time = Histogram()
+
     def hash_password(self, password: str) -> str:
         """
         Хэширует пароль с использованием заданного контекста.
@@ -24,3 +51,58 @@ class PasswordService(IPasswordService):
         """
         return pwd_context.verify(plain_password, hashed_password)
 
+    async def _run(self, func, *args):
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Сервис перегружен, повторите запрос позже",
+                                headers={"Retry-After": "1"})
+
+        def timed_call(submitted: float):
+            return time.perf_counter() - submitted, func(*args)
+
+        self.pending += 1
+        try:
+            queue_time, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed_call, time.perf_counter()
+            )
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self.queue_time.observe(queue_time)
+        return result
+
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Хэширует пароль в пуле потоков, не блокируя цикл событий.
+
+        :param password: Пароль в открытом виде, который нужно хэшировать.
+        :return: str: Хэшированный пароль.
+        :raises HTTPException: Если очередь пула переполнена.
+        """
+        return await self._run(self.hash_password, password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Проверяет пароль в пуле потоков, не блокируя цикл событий.
+
+        :param plain_password: Открытый пароль, который нужно проверить.
+        :param hashed_password: Хэшированный пароль для проверки.
+        :return: bool: True, если пароль совпадает, иначе False.
+        :raises HTTPException: Если очередь пула переполнена.
+        """
+        return await self._run(self.verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Возвращает метрики пула: глубину очереди и время ожидания потока."""
+        return {
+            "workers": self.max_workers,
+            "in_progress": min(self.pending, self.max_workers),
+            "queued": max(self.pending - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_time_avg": self.queue_time_total / self.completed if self.completed else 0.0,
+            "queue_time_max": self.queue_time_max,
+            "queue_time": self.queue_time.snapshot(),
+        }
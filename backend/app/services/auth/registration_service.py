@@ -37,11 +37,10 @@ class RegistrationService:
         self.permission.verify_superuser(current_user)
 
         # Проверка, если пользователь с таким email уже зарегистрирован
-        existing_user = await self.user_repository.get_by_email(db, email=schema.email)
-        if existing_user:
+        if await self.user_repository.exist(db, email=schema.email):
             raise HTTPException(status_code=400, detail="Email уже зарегистрирован")
 
-        hashed_password = self.pass_service.hash_password(schema.password)
+        hashed_password = await self.pass_service.hash_password_async(schema.password)
         user = await self.user_repository.create_user(db, schema=schema, hashed_password=hashed_password)
 
         return user
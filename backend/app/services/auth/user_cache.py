@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models import User
+
+
+class UserCache:
+    """
+    Кэш аутентифицированных пользователей с ограничением по времени жизни (TTL) и размеру (LRU).
+
+    Хранит снимок колонок пользователя, а не ORM-объект, поэтому каждый вызов get
+    возвращает новый объект, не привязанный ни к одной сессии.
+    Кэш локален для процесса: изменения из других воркеров видны не позже чем через TTL.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        """
+        :param ttl: Время жизни записи, в секундах (0 - кэш выключен).
+        :param max_size: Максимальное число записей.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: OrderedDict[int, Tuple[float, dict]] = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Возвращает пользователя из кэша или None, если записи нет или она устарела."""
+        item = self._items.get(user_id)
+        if item is None:
+            return None
+        expires_at, data = item
+        if expires_at < time.monotonic():
+            self._items.pop(user_id, None)
+            return None
+        self._items.move_to_end(user_id)
+        return User(**data)
+
+    def set(self, user: User) -> None:
+        """Сохраняет снимок пользователя в кэш."""
+        if self.ttl <= 0:
+            return
+        self._items[user.id] = (time.monotonic() + self.ttl, user.model_dump())
+        self._items.move_to_end(user.id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Удаляет пользователя из кэша."""
+        self._items.pop(user_id, None)
+
+    def invalidate_after_commit(self, db: AsyncSession, user_id: int) -> None:
+        """
+        Удаляет пользователя из кэша после коммита транзакции сессии.
+
+        Если сбросить запись до коммита, параллельный запрос успеет загрузить из БД
+        ещё не изменённого пользователя и вернуть его в кэш на весь TTL.
+        """
+        event.listen(db.sync_session, "after_commit", lambda session: self.invalidate(user_id), once=True)
@@ -1,27 +1,63 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.models import User
 from backend.app.models.schemas import Msg
 from backend.app.models.user import UserUpdate
+from backend.app.models.user_balance_summary import UserSummaryRead, UserSummaryPage, UserListFilter
+from backend.app.repositories.account_repositories import AccountRepository
+from backend.app.repositories.user_balance_summary_repository import UserBalanceSummaryRepository
 from backend.app.repositories.user_repositories import UserRepository
 from backend.app.services.auth.password_service import PasswordService
 from backend.app.services.auth.permission import PermissionService
+from backend.app.services.auth.user_cache import UserCache
+from backend.app.services.helpers import encode_key_cursor, decode_key_cursor
+from backend.core.db import DatabaseSessionManager
+
+# Преобразование значения поля сортировки из курсора
+SORT_VALUE_TYPES = {
+    "id": int,
+    "account_count": int,
+    "total_balance": Decimal,
+    "last_payment_at": datetime.fromisoformat,
+}
+
+
+def _with_full_name(data: dict) -> dict:
+    """Добавляет вычисляемое поле full_name, как в UserRead."""
+    data["full_name"] = f"{data['first_name'] or ''} {data['last_name'] or ''}".strip()
+    return data
 
 
 class UserService:
     """Сервис управления пользователями"""
 
-    def __init__(self, user_repository: UserRepository, permission: PermissionService, pass_service: PasswordService):
+    def __init__(self, user_repository: UserRepository, permission: PermissionService, pass_service: PasswordService,
+                 user_cache: UserCache, summary_repository: UserBalanceSummaryRepository,
+                 account_repository: AccountRepository, session_manager: DatabaseSessionManager):
         """
         Инициализация сервиса управления пользователями.
 
         :param user_repository: Репозиторий для работы с пользователями.
         :param permission: Сервис для проверки прав доступа.
         :param pass_service: Сервис для работы с паролями.
+        :param user_cache: Кэш аутентифицированных пользователей, сбрасываемый при изменениях.
+        :param summary_repository: Репозиторий сводки по счетам пользователей.
+        :param account_repository: Репозиторий счетов, для быстрого ответа /me.
+        :param session_manager: Менеджер сессий для потоковой выгрузки списка пользователей.
         """
         self.user_repository = user_repository
         self.permission = permission
         self.pass_service = pass_service
+        self.user_cache = user_cache
+        self.summary_repository = summary_repository
+        self.account_repository = account_repository
+        self.session_manager = session_manager
 
     async def update_user(self, db: AsyncSession, schema: UserUpdate, user_id: int, current_user: User) -> User:
         """
@@ -37,9 +73,11 @@ class UserService:
         self.permission.verify_superuser(current_user)
         existing_user = await self.user_repository.get_or_404(db, id=user_id)
         if schema.password:
-            existing_user.hashed_password = self.pass_service.hash_password(schema.password)
-        return await self.user_repository.update(db=db, model=existing_user,
+            existing_user.hashed_password = await self.pass_service.hash_password_async(schema.password)
+        user = await self.user_repository.update(db=db, model=existing_user,
                                                  schema=schema.model_dump(exclude_unset=True, exclude={"password"}))
+        self.user_cache.invalidate_after_commit(db, user_id)
+        return user
 
     async def delete_user(self, db: AsyncSession, current_user: User, user_id: int) -> Msg:
         """
@@ -54,6 +92,7 @@ class UserService:
         self.permission.verify_superuser(current_user)
         target_user = await self.user_repository.get_or_404(db, id=user_id)
         await self.user_repository.delete_user(db=db, user_id=target_user.id)
+        self.user_cache.invalidate_after_commit(db, user_id)
         return Msg(msg="Пользователь удален успешно")
 
     async def get_user_me(self, db: AsyncSession, current_user: User):
@@ -66,15 +105,107 @@ class UserService:
         """
         return await self.user_repository.get_or_404(db=db, id=current_user.id, options=[selectinload(User.accounts)])
 
-    async def get_users(self, db: AsyncSession, current_user: User):
+    @staticmethod
+    def _filters(params: UserListFilter) -> list:
+        return UserBalanceSummaryRepository.user_filters(
+            params.email_prefix, params.is_superuser, params.created_from, params.created_to
+        )
+
+    async def _users_page(self, db: AsyncSession, current_user: User, params: UserListFilter, limit: int,
+                          cursor: Optional[str]) -> Tuple[list, Optional[str]]:
+        self.permission.verify_superuser(current_user)
+        after = decode_key_cursor(cursor, params.sort_by, SORT_VALUE_TYPES[params.sort_by]) if cursor else None
+        rows = await self.summary_repository.list_users(
+            db, self._filters(params), params.sort_by, params.order == "desc", limit + 1, after
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_key_cursor(params.sort_by, getattr(last, params.sort_by), last.id)
+        return rows, next_cursor
+
+    async def get_users(self, db: AsyncSession, current_user: User, params: UserListFilter, limit: int,
+                        cursor: Optional[str] = None) -> UserSummaryPage:
         """
-        Получает всех пользователей, кроме суперпользователей.
+        Получает страницу пользователей со сводкой по их счетам.
+
+        Данные берутся из таблицы user_balance_summary без загрузки счетов,
+        страницы выбираются по курсору (keyset) без OFFSET.
 
         :param db: Асинхронная сессия базы данных.
         :param current_user: Текущий пользователь, выполняющий операцию.
-        :return: Список пользователей, исключая суперпользователей.
+        :param params: Фильтры и сортировка списка.
+        :param limit: Размер страницы.
+        :param cursor: Курсор следующей страницы из предыдущего ответа.
+        :return: Страница пользователей и курсор следующей страницы.
+        :raises HTTPException: Если текущий пользователь не имеет прав суперпользователя или курсор некорректен.
+        """
+        rows, next_cursor = await self._users_page(db, current_user, params, limit, cursor)
+        return UserSummaryPage(
+            items=[UserSummaryRead.model_validate(row, from_attributes=True) for row in rows],
+            next_cursor=next_cursor
+        )
+
+    async def get_users_data(self, db: AsyncSession, current_user: User, params: UserListFilter, limit: int,
+                             cursor: Optional[str] = None) -> dict:
+        """
+        Быстрый вариант get_users: страница собирается из строк запроса без валидации UserSummaryRead.
+
+        :return: Данные страницы в формате UserSummaryPage, суммарный баланс - Decimal.
+        :raises HTTPException: Если текущий пользователь не имеет прав суперпользователя или курсор некорректен.
+        """
+        rows, next_cursor = await self._users_page(db, current_user, params, limit, cursor)
+        return {"items": [_with_full_name(row._asdict()) for row in rows], "next_cursor": next_cursor}
+
+    async def get_user_me_data(self, db: AsyncSession, current_user: User) -> dict:
+        """
+        Быстрый вариант get_user_me: пользователь и счета собираются из строк запросов без ORM-объектов.
+
+        :param db: Асинхронная сессия базы данных.
+        :param current_user: Текущий пользователь.
+        :return: Данные в формате UserAccountRead, балансы - Decimal.
+        :raises HTTPException: Если пользователь не найден.
+        """
+        user = await self.user_repository.get_read_row(db, current_user.id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="Объект не найден")
+        accounts = await self.account_repository.get_rows_by_user(db, current_user.id)
+        data = _with_full_name(user._asdict())
+        data["accounts"] = [account._asdict() for account in accounts]
+        return data
+
+    def verify_list_access(self, current_user: User) -> None:
+        """
+        Проверяет право просматривать список пользователей.
+
         :raises HTTPException: Если текущий пользователь не имеет прав суперпользователя.
         """
         self.permission.verify_superuser(current_user)
-        return await self.user_repository.base_filter(db,  User.is_superuser==False, options=[selectinload(User.accounts)])
 
+    async def export_users(self, params: UserListFilter) -> AsyncIterator[str]:
+        """
+        Потоково выгружает всех пользователей со сводкой в формате NDJSON.
+
+        Строки читаются серверным курсором в собственной сессии и сериализуются по одной,
+        поэтому память не зависит от числа пользователей. Права доступа проверяются
+        заранее через verify_list_access.
+
+        :param params: Фильтры и сортировка списка.
+        :return: Асинхронный итератор строк NDJSON.
+        """
+        async with self.session_manager.create_session() as db:
+            async for row in self.summary_repository.stream_users(
+                    db, self._filters(params), params.sort_by, params.order == "desc"
+            ):
+                yield json.dumps({
+                    "id": row.id,
+                    "email": row.email,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "is_superuser": row.is_superuser,
+                    "created_at": row.created_at.isoformat(),
+                    "account_count": row.account_count,
+                    "total_balance": str(row.total_balance),
+                    "last_payment_at": row.last_payment_at.isoformat() if row.last_payment_at else None,
+                }) + "\n"
@@ -1,20 +1,148 @@
+import base64
 import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Tuple, Mapping, Any, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson не установлен - стандартный декодер
+    json_loads = json.loads
 
 from backend.app.models.schemas import WebhookRequest
 from backend.core.config import settings
+from backend.core.metrics import webhook_outcomes
+
+
+# Поля, входящие в подпись, в алфавитном порядке (без самого signature)
+SIGNATURE_FIELDS = tuple(sorted(name for name in WebhookRequest.model_fields if name != "signature"))
+
+# Предварительно инициализированный ключом HMAC: на каждый вызов только копируется
+_hmac_template = hmac.new(settings.SECRET_PAYMENT_KEY.encode(), digestmod=hashlib.sha256)
+
+
+def compute_signature(fields: Mapping[str, Any]) -> str:
+    """
+    Вычисляет подпись вебхука по значениям полей.
+
+    Строка для подписи - значения SIGNATURE_FIELDS, склеенные одним join.
+    Работает как с полями модели, так и с распарсенным телом запроса.
+
+    :param fields: Значения полей вебхука.
+    :return: Подпись в виде hex-строки.
+    """
+    payload = "".join([str(fields[name]) for name in SIGNATURE_FIELDS])
+    if settings.WEBHOOK_SIGNATURE_ALGORITHM == "hmac-sha256":
+        hasher = _hmac_template.copy()
+        hasher.update(payload.encode())
+        return hasher.hexdigest()
+    return hashlib.sha256((payload + settings.SECRET_PAYMENT_KEY).encode()).hexdigest()
+
+
+def signature_matches(fields: Mapping[str, Any], signature: str) -> bool:
+    """Сравнивает подпись с ожидаемой за постоянное время."""
+    return hmac.compare_digest(compute_signature(fields).encode(), signature.encode())
+
+
+def is_signature_valid(webhook_data: WebhookRequest) -> bool:
+    """Проверяет подпись вебхука."""
+    return signature_matches(webhook_data.__dict__, webhook_data.signature)
 
 
 def verify_signature(webhook_data: WebhookRequest) -> str:
-    # Сортируем ключи в алфавитном порядке
-    sorted_data = dict(sorted(webhook_data.model_dump().items()))
-
-    # Формируем строку для подписи (без самого signature)
-    signature_str = ""
-    for key, value in sorted_data.items():
-        if key != "signature":
-            signature_str += str(value)
-
-    signature_str += settings.SECRET_PAYMENT_KEY
-    # Вычисляем хеш
-    expected_signature = hashlib.sha256(signature_str.encode()).hexdigest()
-    return expected_signature
+    """Возвращает ожидаемую подпись вебхука."""
+    return compute_signature(webhook_data.__dict__)
+
+
+# Ожидаемые JSON-типы полей вебхука для быстрого пути разбора
+WEBHOOK_FIELD_TYPES = {name: field.annotation for name, field in WebhookRequest.model_fields.items()}
+
+
+def parse_webhook_body(raw: bytes) -> WebhookRequest:
+    """
+    Разбирает тело вебхука и проверяет подпись до построения модели.
+
+    Тело декодируется один раз; поддельные и повреждённые запросы отклоняются
+    без создания Pydantic-моделей. Тело с точными JSON-типами полей превращается
+    в модель без повторной валидации, остальные проходят обычную валидацию Pydantic.
+
+    :param raw: Тело запроса.
+    :return: Вебхук с проверенной подписью.
+    :raises RequestValidationError: Если тело не является корректным вебхуком.
+    :raises HTTPException: Если подпись некорректна.
+    """
+    try:
+        fields = json_loads(raw)
+    except ValueError:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error"}])
+    if not isinstance(fields, dict):
+        raise RequestValidationError([{"type": "model_type", "loc": ("body",), "msg": "Input should be an object"}])
+
+    # type(...) is, а не isinstance: bool не должен проходить как int
+    if all(type(fields.get(name)) is field_type for name, field_type in WEBHOOK_FIELD_TYPES.items()):
+        if not signature_matches(fields, fields["signature"]):
+            webhook_outcomes.labels("invalid_signature").inc()
+            raise HTTPException(status.HTTP_403_FORBIDDEN, "Invalid signature")
+        return WebhookRequest.model_construct(**{name: fields[name] for name in WEBHOOK_FIELD_TYPES})
+
+    try:
+        webhook_data = WebhookRequest.model_validate(fields)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+    if not is_signature_valid(webhook_data):
+        webhook_outcomes.labels("invalid_signature").inc()
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Invalid signature")
+    return webhook_data
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Кодирует ключ keyset-пагинации (created_at, id) в непрозрачный курсор."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{item_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Декодирует курсор keyset-пагинации.
+
+    :raises HTTPException: Если курсор повреждён.
+    """
+    try:
+        created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Некорректный курсор")
+
+
+def encode_key_cursor(sort_by: str, value: Any, item_id: int) -> str:
+    """Кодирует ключ keyset-пагинации (поле сортировки, значение, id) в непрозрачный курсор."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif value is not None:
+        value = str(value)
+    return base64.urlsafe_b64encode(json.dumps([sort_by, value, item_id]).encode()).decode()
+
+
+def decode_key_cursor(cursor: str, sort_by: str, value_type: Callable[[str], Any]) -> Tuple[Any, int]:
+    """
+    Декодирует курсор keyset-пагинации, выданный для той же сортировки.
+
+    :param cursor: Курсор из предыдущей страницы.
+    :param sort_by: Текущее поле сортировки.
+    :param value_type: Преобразование строкового значения к типу поля (int, Decimal, datetime.fromisoformat).
+    :return: Значение поля сортировки и id последней строки.
+    :raises HTTPException: Если курсор повреждён или выдан для другой сортировки.
+    """
+    try:
+        cursor_sort_by, value, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if cursor_sort_by != sort_by:
+            raise ValueError(cursor_sort_by)
+        return (None if value is None else value_type(value)), int(item_id)
+    except (ValueError, TypeError, ArithmeticError, UnicodeDecodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Некорректный курсор")
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models import Account
+from backend.app.models.payment import PaymentCreate
+from backend.app.models.schemas import WebhookResult
+from backend.app.repositories.account_repositories import AccountRepository
+from backend.app.repositories.payment_repositiry import PaymentRepository
+from backend.app.repositories.user_balance_summary_repository import UserBalanceSummaryRepository
+from backend.core.db import DatabaseSessionManager
+from backend.core.metrics import balance_update_duration
+
+logger = logging.getLogger(__name__)
+
+
+class AccountCreditCoalescer:
+    def __init__(self, payment_repository: PaymentRepository, account_repository: AccountRepository,
+                 summary_repository: UserBalanceSummaryRepository, session_manager: DatabaseSessionManager,
+                 window: float, max_batch: int):
+        """
+        Объединяет зачисления на один счёт, поступившие в течение короткого окна,
+        в одну транзакцию с одним обновлением баланса.
+
+        :param payment_repository: Репозиторий для работы с платежами.
+        :param account_repository: Репозиторий для работы со счетами.
+        :param summary_repository: Репозиторий сводки по счетам пользователей.
+        :param session_manager: Менеджер сессий, в которых применяются объединённые зачисления.
+        :param window: Окно накопления зачислений, в секундах.
+        :param max_batch: Размер пакета, при достижении которого он применяется не дожидаясь окна.
+        """
+        self.payment_repository = payment_repository
+        self.account_repository = account_repository
+        self.summary_repository = summary_repository
+        self.session_manager = session_manager
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[int, List[Tuple[PaymentCreate, int, asyncio.Future]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, payment: PaymentCreate, user_id: int) -> WebhookResult:
+        """
+        Ставит зачисление в очередь счёта и ожидает применения пакета.
+
+        Счёт и его владелец проверяются в транзакции объединителя, поэтому вызывающий
+        не должен держать собственное соединение на время ожидания.
+
+        :param payment: Данные платежа.
+        :param user_id: ID пользователя, которому адресован платёж.
+        :return: Результат со статусом success (и балансом после применения пакета), duplicate,
+            wrong_owner или account_not_found.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        account_id = payment.account_id
+        batch = self._pending.setdefault(account_id, [])
+        batch.append((payment, user_id, future))
+        if len(batch) >= self.max_batch:
+            self._schedule_flush(account_id)
+        elif account_id not in self._timers:
+            self._timers[account_id] = loop.call_later(self.window, self._schedule_flush, account_id)
+        return await future
+
+    async def stop(self) -> None:
+        """Применяет накопленные зачисления, не дожидаясь окна, и ожидает завершения всех пакетов."""
+        for account_id in list(self._pending):
+            self._schedule_flush(account_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _schedule_flush(self, account_id: int) -> None:
+        timer = self._timers.pop(account_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(account_id, None)
+        if batch:
+            task = asyncio.create_task(self._flush(account_id, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, account_id: int, batch: List[Tuple[PaymentCreate, int, asyncio.Future]]) -> None:
+        try:
+            async with self.session_manager.create_session() as db:
+                async with self.session_manager.transaction(db):
+                    results = await self._apply(db, account_id, batch)
+        except Exception as e:
+            logger.exception(f"Ошибка применения пакета зачислений на счёт {account_id}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _apply(self, db: AsyncSession, account_id: int,
+                     batch: List[Tuple[PaymentCreate, int, asyncio.Future]]) -> List[WebhookResult]:
+        account = await self.account_repository.get_columns(db, (Account.id, Account.user_id), id=account_id)
+        if account is None:
+            return [WebhookResult(transaction_id=p.transaction_id, status="account_not_found") for p, _, _ in batch]
+
+        # Повтор transaction_id внутри пакета считается дубликатом первого вхождения
+        seen = set()
+        first_occurrences = []
+        for payment, user_id, _ in batch:
+            if user_id == account.user_id and payment.transaction_id not in seen:
+                seen.add(payment.transaction_id)
+                first_occurrences.append(payment)
+
+        inserted = await self.payment_repository.create_many_if_absent(db, first_occurrences)
+        new_balance = None
+        if inserted:
+            amount = sum(
+                (Decimal(str(p.amount)) for p in first_occurrences if p.transaction_id in inserted),
+                Decimal('0')
+            )
+            started = time.perf_counter()
+            new_balance = await self.account_repository.credit_balance(db, account_id, amount)
+            balance_update_duration.observe(time.perf_counter() - started)
+            await self.summary_repository.apply_credits(db, {account.user_id: amount})
+
+        first_ids = {id(payment) for payment in first_occurrences}
+        results = []
+        for payment, user_id, _ in batch:
+            if user_id != account.user_id:
+                result_status = "wrong_owner"
+            elif id(payment) in first_ids and payment.transaction_id in inserted:
+                result_status = "success"
+            else:
+                result_status = "duplicate"
+            results.append(WebhookResult(
+                transaction_id=payment.transaction_id,
+                status=result_status,
+                new_balance=new_balance if result_status == "success" else None,
+            ))
+        return results
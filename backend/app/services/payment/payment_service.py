@@ -1,14 +1,21 @@
+import time
+from collections import defaultdict, Counter
 from decimal import Decimal
+from typing import List
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.models import Account, User, Payment
 from backend.app.models.payment import PaymentCreate
-from backend.app.models.schemas import WebhookRequest
-from backend.app.services.helpers import verify_signature
+from backend.app.models.schemas import WebhookRequest, WebhookResult
+from backend.app.services.helpers import is_signature_valid
+from backend.core.config import settings
+from backend.core.metrics import webhook_outcomes, balance_update_duration
 
 
 class PaymentService:
-    def __init__(self, payment_repository, account_repository, user_repository, permissions, account_service):
+    def __init__(self, payment_repository, account_repository, user_repository, permissions, account_service,
+                 summary_repository, coalescer=None):
         """
         Сервис для обработки платёжных транзакций.
 
@@ -17,26 +24,47 @@ class PaymentService:
         :param user_repository: Репозиторий для работы с пользователями.
         :param permissions: Сервис проверки прав доступа.
         :param account_service: Сервис управления счетами.
+        :param summary_repository: Репозиторий сводки по счетам пользователей.
+        :param coalescer: Объединитель зачислений на один счёт (AccountCreditCoalescer) или None.
         """
         self.payment_repository = payment_repository
         self.account_repository = account_repository
         self.user_repository = user_repository
         self.permissions = permissions
         self.account_service = account_service
+        self.summary_repository = summary_repository
+        self.coalescer = coalescer
 
-    async def _validate_payment_data(self, db, data):
+    @staticmethod
+    def _validate_payment_data(data):
         """
         Проверяет корректность входящих платёжных данных.
 
-        :param db: Сессия базы данных.
+        Уникальность transaction_id проверяется при вставке платежа уникальным индексом.
+
         :param data: Вебхук-запрос от платёжной системы.
-        :raises HTTPException: Если подпись некорректна или транзакция уже существует.
+        :raises HTTPException: Если подпись некорректна.
         """
-        if data.signature != verify_signature(data):
+        if not is_signature_valid(data):
+            webhook_outcomes.labels("invalid_signature").inc()
             raise HTTPException(status.HTTP_403_FORBIDDEN, "Invalid signature")
 
-        if await self.payment_repository.exist(db, transaction_id=data.transaction_id):
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Транзакция {data.transaction_id} уже существует")
+    async def _get_account(self, db, data):
+        """
+        Получает существующий счёт по ID с проверкой владельца.
+
+        Загружаются только id и user_id счёта, без создания ORM-объекта.
+
+        :param db: Сессия базы данных.
+        :param data: Вебхук-запрос от платёжной системы.
+        :return: Строка (id, user_id) счёта или None, если счёт не найден.
+        :raises HTTPException: Если id счёта найдено, но принадлежит другому пользователю.
+        """
+        account = await self.account_repository.get_columns(db, (Account.id, Account.user_id), id=data.account_id)
+        if account and account.user_id != data.user_id:
+            webhook_outcomes.labels("wrong_owner").inc()
+            raise HTTPException(400, "Счет принадлежит другому пользователю")
+        return account
 
     async def _get_or_create_account(self, db, data):
         """
@@ -44,35 +72,193 @@ class PaymentService:
 
         :param db: Сессия базы данных.
         :param data: Вебхук-запрос от платёжной системы.
-        :return: Счёт, связанный с пользователем.
+        :return: Счёт, связанный с пользователем (строка или созданный объект Account).
         :raises HTTPException: Если id счёта найдено, но принадлежит другому пользователю.
         """
-        account = await self.account_repository.get(db, id=data.account_id)
-        if account and account.user_id != data.user_id:
-            raise HTTPException(400, "Счет принадлежит другому пользователю")
+        account = await self._get_account(db, data)
         if not account:
-            user = await self.user_repository.get_or_404(db, id=data.user_id)
+            user = await self.user_repository.get_columns(db, (User.id,), id=data.user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Объект не найден")
             account = await self.account_service.create_account(db, user)
         return account
 
-    async def process_payment(self, db: AsyncSession, data: WebhookRequest):
+    async def _process_coalesced(self, data: WebhookRequest):
+        """
+        Применяет платёж на существующий счёт через объединитель зачислений.
+
+        Проверка счёта, платёж и зачисление выполняются в транзакции объединителя вместе
+        с другими зачислениями на этот счёт, поступившими в то же окно; соединение запроса
+        на время ожидания не занимается.
+
+        :param data: Данные, полученные из вебхука платёжной системы.
+        :return: dict: Статус операции и обновлённый баланс счёта или None, если счёт не найден.
+        :raises HTTPException: Если транзакция уже существует или счёт принадлежит другому пользователю.
+        """
+        result = await self.coalescer.submit(PaymentCreate(
+            transaction_id=data.transaction_id,
+            account_id=data.account_id,
+            amount=data.amount,
+        ), data.user_id)
+        if result.status == "account_not_found":
+            return None
+        webhook_outcomes.labels(result.status).inc()
+        if result.status == "wrong_owner":
+            raise HTTPException(400, "Счет принадлежит другому пользователю")
+        if result.status == "duplicate":
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Транзакция {data.transaction_id} уже существует")
+        return {"status": "success", "new_balance": result.new_balance}
+
+    async def process_payment(self, db: AsyncSession, data: WebhookRequest, signature_verified: bool = False):
         """
         Обрабатывает платёж, обновляет баланс счёта и сохраняет транзакцию.
 
         :param db: Асинхронная сессия базы данных.
         :param data: Данные, полученные из вебхука платёжной системы.
+        :param signature_verified: Подпись уже проверена при разборе тела запроса (parse_webhook_body).
         :return: dict: Статус операции и обновлённый баланс счёта.
         :raises HTTPException: При ошибках валидации данных или доступе к счёту.
         """
-        await self._validate_payment_data(db, data)
+        if not signature_verified:
+            self._validate_payment_data(data)
+        if self.coalescer is not None:
+            # Новый счёт создаётся в транзакции запроса: до коммита он не виден объединителю
+            coalesced = await self._process_coalesced(data)
+            if coalesced is not None:
+                return coalesced
         account = await self._get_or_create_account(db, data)
 
-        await self.payment_repository.create(db, PaymentCreate(
+        payment_id = await self.payment_repository.create_if_absent(db, PaymentCreate(
             transaction_id=data.transaction_id,
             account_id=account.id,
             amount=data.amount,
         ))
+        if payment_id is None:
+            webhook_outcomes.labels("duplicate").inc()
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Транзакция {data.transaction_id} уже существует")
+
+        amount = Decimal(str(data.amount))
+        started = time.perf_counter()
+        new_balance = await self.account_repository.credit_balance(db, account.id, amount)
+        balance_update_duration.observe(time.perf_counter() - started)
+        await self.summary_repository.apply_credits(db, {account.user_id: amount})
+        webhook_outcomes.labels("success").inc()
+        return {"status": "success", "new_balance": new_balance}
+
+    async def _resolve_batch_accounts(self, db: AsyncSession, items: List[WebhookRequest]) -> dict:
+        """
+        Находит и блокирует счета для пакета вебхуков, создавая недостающие.
+
+        Существующие счета блокируются одним запросом в порядке id, ID пользователей загружаются
+        одним запросом, без создания ORM-объектов. Для каждой пары (account_id, user_id) без счёта
+        создаётся ровно один новый счёт; новые счета учитываются в сводке вместе с зачислениями.
+
+        :param db: Асинхронная сессия базы данных.
+        :param items: Вебхуки с корректной подписью и ещё не записанными транзакциями.
+        :return: Словарь (account_id, user_id) -> счёт или строка со статусом ошибки.
+        """
+        keys = sorted({(item.account_id, item.user_id) for item in items})
+        accounts = {
+            account.id: account
+            for account in await self.account_repository.lock_for_credit(
+                db, (account_id for account_id, _ in keys)
+            )
+        }
+        missing_user_ids = {user_id for account_id, user_id in keys if account_id not in accounts}
+        users = {}
+        if missing_user_ids:
+            users = {
+                user.id: user
+                for user in await self.user_repository.project(db, (User.id,), User.id.in_(missing_user_ids))
+            }
+
+        resolved = {}
+        for account_id, user_id in keys:
+            account = accounts.get(account_id)
+            if account is not None:
+                resolved[(account_id, user_id)] = account if account.user_id == user_id else "wrong_owner"
+            elif user_id in users:
+                resolved[(account_id, user_id)] = await self.account_service.create_account(
+                    db, users[user_id], update_summary=False
+                )
+            else:
+                resolved[(account_id, user_id)] = "user_not_found"
+        return resolved
+
+    async def process_batch(self, db: AsyncSession, items: List[WebhookRequest]) -> List[WebhookResult]:
+        """
+        Обрабатывает пакет вебхуков множественными запросами вместо запроса на каждый платёж.
+
+        Подписи проверяются для всех элементов, платежи вставляются одним запросом
+        с пропуском дубликатов по transaction_id, а балансы счетов обновляются одним
+        запросом по агрегированным суммам.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param items: Вебхуки от платёжной системы.
+        :return: Результаты обработки в порядке входящих элементов.
+        :raises HTTPException: Если пакет превышает допустимый размер.
+        """
+        if len(items) > settings.WEBHOOK_BATCH_MAX_SIZE:
+            raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                f"Пакет не может содержать больше {settings.WEBHOOK_BATCH_MAX_SIZE} вебхуков")
+
+        statuses: List[str | None] = [None] * len(items)
+        seen = set()
+        for index, item in enumerate(items):
+            if not is_signature_valid(item):
+                statuses[index] = "invalid_signature"
+            elif item.transaction_id in seen:
+                statuses[index] = "duplicate"
+            else:
+                seen.add(item.transaction_id)
+
+        # Уже записанные транзакции отсеиваются до поиска счетов, чтобы пакет из одних повторов
+        # не создавал пустые счета
+        known = await self.payment_repository.exists_many(db, Payment.transaction_id, seen)
+        for index, item in enumerate(items):
+            if statuses[index] is None and item.transaction_id in known:
+                statuses[index] = "duplicate"
+
+        pending = [index for index, item_status in enumerate(statuses) if item_status is None]
+        resolved = await self._resolve_batch_accounts(db, [items[index] for index in pending]) if pending else {}
+
+        payments = {}
+        for index in pending:
+            item = items[index]
+            account = resolved[(item.account_id, item.user_id)]
+            if isinstance(account, str):
+                statuses[index] = account
+            else:
+                payments[index] = PaymentCreate(transaction_id=item.transaction_id, account_id=account.id,
+                                                amount=item.amount)
+
+        inserted = await self.payment_repository.create_many_if_absent(db, list(payments.values()))
+
+        new_accounts = Counter(
+            account.user_id for account in resolved.values() if isinstance(account, Account)
+        )
+        deltas = defaultdict(Decimal)
+        user_deltas = defaultdict(Decimal)
+        for index, payment in payments.items():
+            if payment.transaction_id in inserted:
+                statuses[index] = "success"
+                amount = Decimal(str(payment.amount))
+                deltas[payment.account_id] += amount
+                user_deltas[items[index].user_id] += amount
+            else:
+                statuses[index] = "duplicate"
+        started = time.perf_counter()
+        balances = await self.account_repository.credit_balances(db, dict(deltas))
+        balance_update_duration.observe(time.perf_counter() - started)
+        await self.summary_repository.apply_credits(db, dict(user_deltas), dict(new_accounts))
+        for outcome, count in Counter(statuses).items():
+            webhook_outcomes.labels(outcome).inc(count)
 
-        account.balance += Decimal(str(data.amount))
-        await self.account_repository.save_db(db, account)
-        return {"status": "success", "new_balance": account.balance}
+        return [
+            WebhookResult(
+                transaction_id=item.transaction_id,
+                status=statuses[index],
+                new_balance=balances.get(payments[index].account_id) if statuses[index] == "success" else None,
+            )
+            for index, item in enumerate(items)
+        ]
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.schemas import WebhookRequest, Principal
+from backend.app.models.webhook_inbox import WebhookInbox
+from backend.app.repositories.webhook_inbox_repository import WebhookInboxRepository
+from backend.app.services.helpers import is_signature_valid
+from backend.app.services.payment.payment_service import PaymentService
+from backend.core.db import DatabaseSessionManager
+from backend.core.metrics import webhook_outcomes
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookQueueService:
+    def __init__(self, inbox_repository: WebhookInboxRepository, payment_service: PaymentService,
+                 session_manager: DatabaseSessionManager, concurrency: int, batch_size: int,
+                 poll_interval: float, max_pending: int, max_attempts: int):
+        """
+        Сервис асинхронной обработки вебхуков: приём в inbox и фоновое применение платежей.
+
+        :param inbox_repository: Репозиторий inbox-таблицы вебхуков.
+        :param payment_service: Сервис обработки платежей.
+        :param session_manager: Менеджер сессий базы данных для фоновых воркеров.
+        :param concurrency: Количество параллельных воркеров.
+        :param batch_size: Размер пакета, который воркер забирает за одну транзакцию.
+        :param poll_interval: Пауза между опросами пустого inbox, в секундах.
+        :param max_pending: Допустимое число необработанных вебхуков, сверх которого приём отклоняется.
+        :param max_attempts: Число попыток применить вебхук, после которых он получает статус failed.
+        """
+        self.inbox_repository = inbox_repository
+        self.payment_service = payment_service
+        self.session_manager = session_manager
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        # Оценка очереди: увеличивается при приёме, уменьшается после каждого применённого пакета
+        # и сверяется с базой, когда воркер выбрал inbox до конца
+        self.backlog = 0
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def enqueue(self, db: AsyncSession, data: WebhookRequest, signature_verified: bool = False) -> dict:
+        """
+        Проверяет подпись и записывает вебхук в inbox без применения платежа.
+
+        :param db: Асинхронная транзакционная сессия базы данных.
+        :param data: Вебхук-запрос от платёжной системы.
+        :param signature_verified: Подпись уже проверена при разборе тела запроса (parse_webhook_body).
+        :return: dict: Статус приёма вебхука.
+        :raises HTTPException: Если подпись некорректна или очередь переполнена.
+        """
+        if not signature_verified and not is_signature_valid(data):
+            webhook_outcomes.labels("invalid_signature").inc()
+            raise HTTPException(status.HTTP_403_FORBIDDEN, "Invalid signature")
+        if self.backlog >= self.max_pending:
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Очередь вебхуков переполнена",
+                                headers={"Retry-After": str(max(1, int(self.poll_interval)))})
+
+        if await self.inbox_repository.enqueue(db, data):
+            self.backlog += 1
+            webhook_outcomes.labels("accepted").inc()
+            return {"status": "accepted", "transaction_id": data.transaction_id}
+        webhook_outcomes.labels("duplicate").inc()
+        return {"status": "duplicate", "transaction_id": data.transaction_id}
+
+    async def get_status(self, db: AsyncSession, transaction_id: str, principal: Principal) -> WebhookInbox:
+        """
+        Возвращает состояние обработки вебхука по transaction_id.
+
+        Обычный пользователь видит только вебхуки, адресованные ему; для чужих вебхуков
+        возвращается 404, чтобы не раскрывать существование транзакции.
+
+        :param db: Асинхронная сессия базы данных.
+        :param transaction_id: ID транзакции платёжной системы.
+        :param principal: Текущий пользователь.
+        :return: Запись inbox.
+        :raises HTTPException: Если вебхук с таким transaction_id не принимался или адресован другому пользователю.
+        """
+        entry = await self.inbox_repository.get(db, transaction_id=transaction_id)
+        if not entry or (not principal.is_superuser and entry.payload.get("user_id") != principal.id):
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Вебхук не найден")
+        return entry
+
+    async def _apply(self, db: AsyncSession, entries: List[Tuple[int, dict]]) -> None:
+        """Применяет записи inbox через PaymentService и сохраняет их статусы в точке сохранения."""
+        async with db.begin_nested():
+            results = await self.payment_service.process_batch(
+                db, [WebhookRequest.model_validate(payload) for _, payload in entries]
+            )
+            await self.inbox_repository.mark_processed(
+                db, {entry_id: result.status for (entry_id, _), result in zip(entries, results)},
+                datetime.now(timezone.utc)
+            )
+
+    async def _apply_one_by_one(self, db: AsyncSession, entries: List[Tuple[int, dict]]) -> None:
+        """Применяет записи по одной, учитывая неудачные попытки для записей с ошибкой."""
+        for entry in entries:
+            try:
+                await self._apply(db, [entry])
+            except Exception as e:
+                entry_id = entry[0]
+                failed = await self.inbox_repository.record_failure(
+                    db, entry_id, repr(e), self.max_attempts, datetime.now(timezone.utc)
+                )
+                if failed:
+                    webhook_outcomes.labels("failed").inc()
+                    logger.error(f"Вебхук {entry_id} переведён в failed после {self.max_attempts} попыток: {e!r}")
+                else:
+                    logger.warning(f"Вебхук {entry_id} не применён, будет повторён: {e!r}")
+
+    async def drain_once(self) -> int:
+        """
+        Забирает один пакет из inbox и применяет его через PaymentService в одной транзакции.
+
+        Если пакет не применяется целиком (переполнение суммы, взаимная блокировка и т.п.),
+        записи применяются по одной; для записей с ошибкой увеличивается счётчик попыток,
+        и после WEBHOOK_MAX_ATTEMPTS они получают статус failed, чтобы не блокировать очередь.
+
+        :return: Количество обработанных вебхуков.
+        """
+        async with self.session_manager.create_session() as db:
+            async with self.session_manager.transaction(db):
+                claimed = await self.inbox_repository.claim_pending(db, self.batch_size)
+                entries = [(entry.id, entry.payload) for entry in claimed]
+                if entries:
+                    try:
+                        await self._apply(db, entries)
+                    except Exception:
+                        logger.exception(f"Пакет из {len(entries)} вебхуков не применён, обработка по одному")
+                        await self._apply_one_by_one(db, entries)
+            self.backlog = max(self.backlog - len(entries), 0)
+            if len(entries) < self.batch_size:
+                self.backlog = await self.inbox_repository.count_pending(db)
+        return len(entries)
+
+    async def _worker(self, number: int) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.drain_once()
+            except Exception:
+                logger.exception(f"Воркер вебхуков {number}: ошибка обработки пакета")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def start(self) -> None:
+        """Запускает пул фоновых воркеров."""
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._worker(number)) for number in range(self.concurrency)]
+
+    async def stop(self, timeout: Optional[float] = 10) -> None:
+        """Останавливает воркеры, дожидаясь завершения текущих пакетов."""
+        self._stopping.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._tasks = []
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -10,24 +12,79 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"  # Базовая строка API
     SECRET_KEY: str = ""
     SECRET_PAYMENT_KEY: str = ""
+    # sha256 - sha256(поля + ключ), как у платёжной системы по умолчанию; hmac-sha256 - HMAC с ключом
+    WEBHOOK_SIGNATURE_ALGORITHM: Literal["sha256", "hmac-sha256"] = "sha256"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Добавлять признак суперпользователя в токен, чтобы читающие эндпоинты не обращались к БД.
+    # Изменение прав вступает в силу только после перевыпуска токена.
+    JWT_SUPERUSER_CLAIM: bool = False
+    USER_CACHE_TTL_SECONDS: float = 30  # 0 - кэш пользователей выключен
+    USER_CACHE_MAX_SIZE: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4  # Потоки для bcrypt
+    PASSWORD_HASH_MAX_QUEUE: int = 100  # Сверх этого запросы входа отклоняются с 503
     SERVER_HOST: str = 'http://127.0.0.1:8010'
 
     PROJECT_NAME: str = "API"
+    DEBUG: bool = False  # Отладочные заголовки X-DB-Queries / X-DB-Time-ms в ответах
     POSTGRES_SERVER: str = "pay_db"
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str = ""
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Пул соединений с БД
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # секунды ожидания свободного соединения
+    DB_POOL_RECYCLE: int = -1  # секунды жизни соединения, -1 - без ограничения
+    DB_POOL_PRE_PING: bool = False
+    DB_USE_NULLPOOL: bool = False  # Для развёртывания за PgBouncer: пул держит PgBouncer
+    DB_SLOW_QUERY_MS: float = 200  # Запросы дольше порога логируются как медленные
+    # Кэш подготовленных выражений asyncpg на соединение. За PgBouncer в режиме transaction
+    # нужно 0: с DB_USE_NULLPOOL выражения также получают уникальные имена, чтобы не конфликтовать
+    # на серверных соединениях PgBouncer
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    BULK_CHUNK_SIZE: int = 1000  # Строк в одном запросе массовых операций репозиториев
+
+    # Реплика для чтения (пустой POSTGRES_REPLICA_SERVER - чтение идёт в основную БД)
+    POSTGRES_REPLICA_SERVER: str = ""
+    POSTGRES_REPLICA_PORT: int = 5432
+    # Сколько секунд после записи пользователь читает из основной БД (read-your-writes, в пределах процесса)
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 5
+
     @property
     def database_url(self):
         return (
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def replica_database_url(self):
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_SERVER}:{self.POSTGRES_REPLICA_PORT}/{self.POSTGRES_DB}"
+        )
+
     password_reset_jwt_subject: str = 'present'
 
+    WEBHOOK_BATCH_MAX_SIZE: int = 1000  # Максимальное число вебхуков в одном пакете
+
+    # Ответы на чтение собираются из строк запросов и кодируются orjson без response_model;
+    # суммы (Decimal) передаются строками без потери точности
+    FAST_SERIALIZATION: bool = False
+
+    # Асинхронная обработка вебхуков через inbox-таблицу
+    WEBHOOK_ASYNC_MODE: bool = False
+    WEBHOOK_WORKER_CONCURRENCY: int = 2
+    WEBHOOK_WORKER_BATCH_SIZE: int = 200
+    WEBHOOK_WORKER_POLL_INTERVAL: float = 0.5  # секунды
+    WEBHOOK_INBOX_MAX_PENDING: int = 10000  # При превышении новые вебхуки отклоняются с 503
+    WEBHOOK_MAX_ATTEMPTS: int = 5  # Попыток применить вебхук, после которых он получает статус failed
+
+    # Окно объединения зачислений на один счёт, мс (0 - объединение выключено)
+    PAYMENT_COALESCE_WINDOW_MS: float = 0
+
 
 settings = Settings()
@@ -1,23 +1,113 @@
+import time
+from uuid import uuid4
+
 from backend.core.config import settings
+from backend.core.metrics import Histogram
+from backend.core.query_stats import instrument_engine
+from backend.core.security import OptionalTokenDep, token_subject
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from contextlib import asynccontextmanager
-from typing import Callable, AsyncGenerator, Annotated
+from typing import Callable, AsyncGenerator, Annotated, Optional, Dict
 from fastapi import Depends, HTTPException
 
+# Границы корзин времени ожидания соединения из пула, в секундах
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, измеряющий время ожидания свободного соединения при каждом checkout."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """Создаёт движок с параметрами пула из настроек и подключённым подсчётом запросов."""
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.DB_USE_NULLPOOL:
+        # PgBouncer в режиме transaction переключает серверные соединения между транзакциями,
+        # и стандартные имена asyncpg (__asyncpg_stmt_N__) совпадают у разных клиентов
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        new_engine = create_async_engine(url, echo=False, poolclass=NullPool, connect_args=connect_args)
+    else:
+        new_engine = create_async_engine(
+            url,
+            echo=False,
+            connect_args=connect_args,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    instrument_engine(new_engine)
+    return new_engine
+
 
 database_url = settings.database_url
-engine: AsyncEngine = create_async_engine(database_url, echo=False)
+engine: AsyncEngine = create_engine(database_url)
 
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_database_url = settings.replica_database_url
+replica_engine: Optional[AsyncEngine] = create_engine(replica_database_url) if replica_database_url else None
+replica_session_maker = async_sessionmaker(
+    replica_engine, class_=AsyncSession, expire_on_commit=False
+) if replica_engine else None
+
+
+class RecentWriters:
+    """
+    Пользователи, недавно выполнившие запись.
+
+    Их чтения направляются в основную БД, пока реплика может ещё не получить изменения.
+    Отметки хранятся в памяти процесса: при нескольких воркерах uvicorn/gunicorn чтение,
+    попавшее в другой процесс, может уйти на реплику, поэтому гарантия read-your-writes
+    действует только при одном процессе или sticky-маршрутизации по пользователю.
+    """
+
+    def __init__(self, window: float, max_size: int = 100000):
+        self.window = window
+        self.max_size = max_size
+        self._until: Dict[int, float] = {}
+
+    def mark(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self._until) >= self.max_size:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+        self._until[user_id] = now + self.window
+
+    def is_recent(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._until.pop(user_id, None)
+            return False
+        return True
+
 
 class DatabaseSessionManager:
     """
     Класс для управления асинхронными сессиями базы данных, включая поддержку транзакций и зависимости FastAPI.
     """
 
-    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], engine: Optional[AsyncEngine] = None,
+                 recent_writers: Optional[RecentWriters] = None):
         self.session_maker = session_maker
+        self.engine = engine
+        self.recent_writers = recent_writers
+        self.get_transaction_session = self._make_transaction_dependency()
 
     @asynccontextmanager
     async def create_session(self):
@@ -46,17 +136,57 @@ class DatabaseSessionManager:
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """
         Зависимость для FastAPI, возвращающая сессию без управления транзакцией.
+
+        FastAPI кэширует зависимость в пределах запроса, поэтому зависимость авторизации
+        и обработчик получают одну и ту же сессию. Соединение из пула берётся только
+        при первом обращении к БД: запросы, отклонённые на проверке токена или
+        обслуженные из кэша пользователей, соединение не занимают.
         """
         async with self.create_session() as session:
             yield session
 
-    async def get_transaction_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """
-        Зависимость для FastAPI, возвращающая сессию с управлением транзакцией.
-        """
-        async with self.create_session() as session:
+    def _make_transaction_dependency(self) -> Callable:
+        get_session = self.get_session
+
+        async def get_transaction_session(
+                token: OptionalTokenDep,
+                session: AsyncSession = Depends(get_session)
+        ) -> AsyncGenerator[AsyncSession, None]:
+            """
+            Зависимость для FastAPI, возвращающая сессию запроса с управлением транзакцией.
+
+            Использует ту же сессию, что и SessionDep, поэтому запрос с авторизацией
+            и транзакционным обработчиком занимает одно соединение, а не два.
+            После коммита автор запроса на время читает из основной БД.
+            """
             async with self.transaction(session):
                 yield session
+            if self.recent_writers is not None:
+                user_id = token_subject(token)
+                if user_id is not None:
+                    self.recent_writers.mark(user_id)
+
+        return get_transaction_session
+
+    def pool_stats(self) -> dict:
+        """
+        Возвращает состояние пула соединений: размер, занятые соединения, overflow
+        и гистограмму времени ожидания соединения.
+        """
+        if self.engine is None:
+            return {}
+        pool = self.engine.pool
+        stats = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        if isinstance(pool, InstrumentedQueuePool):
+            stats["wait_time"] = pool.wait_time.snapshot()
+        return stats
 
     @property
     def session_dependency(self) -> Callable:
@@ -69,9 +199,33 @@ class DatabaseSessionManager:
         return Depends(self.get_transaction_session)
 
 
-# Инициализация менеджера сессий базы данных
-session_manager = DatabaseSessionManager(async_session_maker)
+# Инициализация менеджеров сессий базы данных
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_WINDOW_SECONDS) if replica_engine else None
+session_manager = DatabaseSessionManager(async_session_maker, engine, recent_writers)
+read_session_manager = DatabaseSessionManager(
+    replica_session_maker, replica_engine
+) if replica_engine else session_manager
+
+
+async def get_read_session(
+        token: OptionalTokenDep,
+        primary: AsyncSession = session_manager.session_dependency
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Зависимость для FastAPI, возвращающая сессию реплики для читающих эндпоинтов.
+
+    Без настроенной реплики и в течение READ_YOUR_WRITES_WINDOW_SECONDS после
+    собственной записи пользователя возвращается сессия запроса к основной БД.
+    """
+    user_id = token_subject(token) if recent_writers is not None else None
+    if read_session_manager is session_manager or (user_id is not None and recent_writers.is_recent(user_id)):
+        yield primary
+        return
+    async with read_session_manager.create_session() as session:
+        yield session
+
 
 # Зависимости FastAPI для использования сессий
 SessionDep = Annotated[AsyncSession, session_manager.session_dependency]
 TransactionSessionDep = Annotated[AsyncSession, session_manager.transaction_session_dependency]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -0,0 +1,183 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Границы корзин по умолчанию, в секундах
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин.
+
+    Наблюдение стоит один бинарный поиск и два сложения, поэтому её можно
+    вызывать на горячем пути без заметных накладных расходов.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # Последняя корзина - значения больше верхней границы (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """Возвращает накопленные значения корзин (как в Prometheus: le -> количество)."""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class Counter:
+    """Монотонный счётчик."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_histogram(name: str, labels: dict, histogram: Histogram) -> List[str]:
+    """Форматирует гистограмму в текстовом формате Prometheus."""
+    snapshot = histogram.snapshot()
+    lines = [
+        f"{name}_bucket{format_labels({**labels, 'le': bound})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+    return lines
+
+
+def render_samples(name: str, documentation: str, kind: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    """Форматирует набор значений метрики типа kind (gauge, counter) в текстовом формате Prometheus."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{format_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def render_gauges(name: str, documentation: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    """Форматирует набор значений gauge в текстовом формате Prometheus."""
+    return render_samples(name, documentation, "gauge", samples)
+
+
+class MetricFamily:
+    """
+    Семейство метрик с метками.
+
+    Дочерние метрики хранятся по кортежу значений меток; наборы меток, известные заранее,
+    создаются при объявлении, поэтому на горячем пути остаётся один поиск в словаре.
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, factory: Callable,
+                 label_names: Sequence[str] = (), preset: Iterable[tuple] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.factory = factory
+        self.label_names = tuple(label_names)
+        self._children: Dict[tuple, object] = {}
+        for values in preset:
+            self.labels(*values)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self.factory()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.label_names, values))
+            if isinstance(child, Histogram):
+                lines.extend(render_histogram(self.name, labels, child))
+            else:
+                lines.append(f"{self.name}{format_labels(labels)} {child.value}")
+        return lines
+
+
+class Registry:
+    """Реестр метрик, отдаваемых эндпоинтом /metrics."""
+
+    def __init__(self):
+        self._families: List[MetricFamily] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                preset: Iterable[tuple] = ()) -> MetricFamily:
+        family = MetricFamily(name, documentation, "counter", Counter, label_names, preset)
+        self._families.append(family)
+        return family
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS, preset: Iterable[tuple] = ()) -> MetricFamily:
+        family = MetricFamily(name, documentation, "histogram", lambda: Histogram(buckets), label_names, preset)
+        self._families.append(family)
+        return family
+
+    def collector(self, func: Callable[[], List[str]]) -> Callable[[], List[str]]:
+        """Регистрирует функцию, формирующую строки метрик в момент запроса /metrics."""
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# Метрики приложения
+WEBHOOK_OUTCOMES = ("success", "duplicate", "invalid_signature", "wrong_owner", "user_not_found", "accepted",
+                    "failed")
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса по маршрутам", ("route", "method")
+)
+http_requests_total = registry.counter(
+    "http_requests_total", "Количество HTTP-запросов по маршрутам и статусам", ("route", "method", "status")
+)
+webhook_outcomes = registry.counter(
+    "webhook_outcomes_total", "Результаты обработки вебхуков", ("outcome",),
+    preset=[(outcome,) for outcome in WEBHOOK_OUTCOMES]
+)
+balance_update_duration = registry.histogram(
+    "balance_update_duration_seconds", "Время атомарного обновления баланса счёта", preset=[()]
+).labels()
+db_statements_per_request = registry.histogram(
+    "db_statements_per_request", "Количество запросов к БД на HTTP-запрос", ("route",),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50)
+)
+db_time_per_request = registry.histogram(
+    "db_time_per_request_seconds", "Суммарное время запросов к БД на HTTP-запрос", ("route",)
+)
+db_slow_statements = registry.counter(
+    "db_slow_statements_total", "Количество медленных запросов к БД", ("route",)
+)
@@ -0,0 +1,53 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+from backend.core.metrics import http_request_duration, http_requests_total
+from backend.core.query_stats import QueryStats, current_query_stats, record_route_stats
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware, собирающее метрики HTTP-запросов по маршрутам FastAPI.
+
+    Для каждого запроса учитываются время обработки, статус ответа и запросы к БД,
+    агрегированные по шаблону маршрута. С expose_headers число запросов и суммарное время БД
+    возвращаются в заголовках X-DB-Queries и X-DB-Time-ms
+    (учитываются запросы, выполненные до начала отправки ответа).
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = False):
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append("X-DB-Time-ms", f"{stats.total_time * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_query_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            method = scope["method"]
+            http_request_duration.labels(route, method).observe(elapsed)
+            http_requests_total.labels(route, method, status_code).inc()
+            record_route_stats(route, stats)
@@ -0,0 +1,57 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.core.config import settings
+from backend.core.metrics import db_statements_per_request, db_time_per_request, db_slow_statements
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Статистика запросов к БД в рамках одного HTTP-запроса."""
+
+    __slots__ = ("count", "total_time", "slow")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slow: List[str] = []
+
+
+# Статистика текущего HTTP-запроса; None вне запроса (фоновые воркеры, миграции)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def record_route_stats(route: str, stats: QueryStats) -> None:
+    """Добавляет статистику запроса к агрегированным метрикам маршрута."""
+    db_statements_per_request.labels(route).observe(stats.count)
+    db_time_per_request.labels(route).observe(stats.total_time)
+    if stats.slow:
+        db_slow_statements.labels(route).inc(len(stats.slow))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_time += elapsed
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(f"Медленный запрос к БД ({elapsed * 1000:.1f} мс): {statement[:500]}")
+        if stats is not None:
+            stats.slow.append(statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает подсчёт запросов и поиск медленных запросов к событиям движка."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен - стандартный кодировщик
+    orjson = None
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    # orjson кодирует только uuid.UUID, а asyncpg возвращает его подкласс pgproto.UUID
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-ответ, сериализующий словари и списки напрямую, без response_model.
+
+    Используется с данными, собранными из строк запросов: datetime кодируется orjson нативно,
+    UUID (в том числе asyncpg pgproto.UUID) - строкой, Decimal - строкой, чтобы суммы
+    передавались без потери точности.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_orjson_default)
+        return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Optional
 
 import jwt
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from passlib.context import CryptContext
 from backend.core.config import settings
 
@@ -13,11 +14,35 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+
+def optional_token(request: Request) -> Optional[str]:
+    """
+    Возвращает bearer-токен из заголовка Authorization или None.
+
+    В отличие от TokenDep не является схемой безопасности, поэтому не помечает
+    эндпоинты как защищённые в OpenAPI (например, вебхуки платёжной системы).
+    """
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    return token if scheme.lower() == "bearer" and token else None
+
+
+OptionalTokenDep = Annotated[Optional[str], Depends(optional_token)]
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def create_access_token(subject: str, expires_delta: timedelta) -> str:
+def create_access_token(subject: str, expires_delta: timedelta, claims: Optional[dict] = None) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": subject}
+    to_encode = {**(claims or {}), "exp": expire, "sub": subject}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+def token_subject(token: Optional[str]) -> Optional[int]:
+    """Возвращает id пользователя из действительного токена или None, не выбрасывая исключений."""
+    if not token:
+        return None
+    try:
+        return int(jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])["sub"])
+    except (jwt.InvalidTokenError, KeyError, ValueError):
+        return None
@@ -1,11 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
 from backend.app import routers
+from backend.app.api.metrics_api import metrics_router
+from backend.app.dependencies.services import webhook_queue, credit_coalescer
 from backend.core.config import settings
+from backend.core.metrics import http_request_duration
+from backend.core.middleware import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WEBHOOK_ASYNC_MODE:
+        await webhook_queue.start()
+    yield
+    await webhook_queue.stop()
+    if credit_coalescer is not None:
+        await credit_coalescer.stop()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    DEBUG=True
+    DEBUG=True,
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware, expose_headers=settings.DEBUG)
 app.include_router(routers.api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics_router)
+
+# Заранее создаём метрики задержки для всех маршрутов, чтобы они были видны до первого запроса
+for route in app.routes:
+    if isinstance(route, APIRoute):
+        for method in route.methods:
+            http_request_duration.labels(route.path, method)
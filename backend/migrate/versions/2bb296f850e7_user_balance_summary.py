@@ -0,0 +1,54 @@
+"""user balance summary
+
+Revision ID: 2bb296f850e7
+Revises: 801ba6b09597
+Create Date: 2026-10-18 15:12:31.418206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2bb296f850e7'
+down_revision: Union[str, None] = '801ba6b09597'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_balance_summary',
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('account_count', sa.Integer(), nullable=False),
+                    sa.Column('total_balance', sa.Numeric(precision=12, scale=2), server_default='0',
+                              nullable=False),
+                    sa.Column('last_payment_at', sa.DateTime(timezone=True), nullable=True),
+                    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('user_id')
+                    )
+    op.create_index('ix_user_balance_summary_total_balance', 'user_balance_summary',
+                    ['total_balance', 'user_id'], unique=False)
+    op.create_index('ix_user_balance_summary_account_count', 'user_balance_summary',
+                    ['account_count', 'user_id'], unique=False)
+    op.create_index('ix_user_balance_summary_last_payment_at', 'user_balance_summary',
+                    ['last_payment_at', 'user_id'], unique=False)
+    # Заполнение по текущим данным: сводка есть у каждого пользователя, в том числе без счетов
+    op.execute("""
+        INSERT INTO user_balance_summary (user_id, account_count, total_balance, last_payment_at)
+        SELECT u.id,
+               COUNT(a.id),
+               COALESCE(SUM(a.balance), 0),
+               (SELECT MAX(p.created_at) FROM payment p JOIN account pa ON pa.id = p.account_id
+                WHERE pa.user_id = u.id)
+        FROM "user" u
+        LEFT JOIN account a ON a.user_id = u.id
+        GROUP BY u.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_balance_summary_last_payment_at', table_name='user_balance_summary')
+    op.drop_index('ix_user_balance_summary_account_count', table_name='user_balance_summary')
+    op.drop_index('ix_user_balance_summary_total_balance', table_name='user_balance_summary')
+    op.drop_table('user_balance_summary')
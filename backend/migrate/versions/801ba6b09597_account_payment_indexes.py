@@ -0,0 +1,32 @@
+"""account and payment indexes
+
+Revision ID: 801ba6b09597
+Revises: e86207f3e9f1
+Create Date: 2026-10-18 13:05:44.120587
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '801ba6b09597'
+down_revision: Union[str, None] = 'e86207f3e9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Уникальный индекс payment.transaction_id создаётся ревизией ce0e5fea11bc.
+    # CONCURRENTLY - без блокировки записи в account и payment на время построения
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_account_user_id'), 'account', ['user_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_payment_account_id_created_at', 'payment', ['account_id', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payment_account_id_created_at', table_name='payment', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_account_user_id'), table_name='account', postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""user balance summary last_payment_at desc index
+
+Revision ID: 96d3740ce4d9
+Revises: c2326eb37791
+Create Date: 2026-10-18 18:52:31.407215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '96d3740ce4d9'
+down_revision: Union[str, None] = 'c2326eb37791'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Сортировка по убыванию last_payment_at держит NULL в конце; обратный проход
+    # по индексу (last_payment_at, user_id) дал бы NULLS FIRST, поэтому нужен отдельный индекс
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_balance_summary_last_payment_at_desc', 'user_balance_summary',
+                        [sa.text('last_payment_at DESC NULLS LAST'), sa.text('user_id DESC')],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_balance_summary_last_payment_at_desc', table_name='user_balance_summary',
+                      postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""user created_at
+
+Revision ID: 9fcefe3e607a
+Revises: 2bb296f850e7
+Create Date: 2026-10-18 16:03:52.660147
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9fcefe3e607a'
+down_revision: Union[str, None] = '2bb296f850e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Существующим пользователям проставляется время применения миграции
+    op.add_column('user', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+                                    nullable=False))
+    op.create_index(op.f('ix_user_created_at'), 'user', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_created_at'), table_name='user')
+    op.drop_column('user', 'created_at')
@@ -0,0 +1,41 @@
+"""webhook inbox
+
+Revision ID: b2a1cca9ad65
+Revises: ce0e5fea11bc
+Create Date: 2026-10-18 11:02:17.804115
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2a1cca9ad65'
+down_revision: Union[str, None] = 'ce0e5fea11bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('webhook_inbox',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('transaction_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+                    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+                              nullable=False),
+                    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_webhook_inbox_transaction_id'), 'webhook_inbox', ['transaction_id'], unique=True)
+    op.create_index('ix_webhook_inbox_pending', 'webhook_inbox', ['id'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_inbox_pending', table_name='webhook_inbox')
+    op.drop_index(op.f('ix_webhook_inbox_transaction_id'), table_name='webhook_inbox')
+    op.drop_table('webhook_inbox')
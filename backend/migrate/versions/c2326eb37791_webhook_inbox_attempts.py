@@ -0,0 +1,28 @@
+"""webhook inbox attempts
+
+Revision ID: c2326eb37791
+Revises: 9fcefe3e607a
+Create Date: 2026-10-18 18:21:07.530914
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2326eb37791'
+down_revision: Union[str, None] = '9fcefe3e607a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('webhook_inbox', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('webhook_inbox', sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('webhook_inbox', 'last_error')
+    op.drop_column('webhook_inbox', 'attempts')
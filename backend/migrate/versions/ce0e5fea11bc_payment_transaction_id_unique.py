@@ -0,0 +1,41 @@
+"""payment transaction_id unique index
+
+Revision ID: ce0e5fea11bc
+Revises: 4dce975b7c99
+Create Date: 2026-10-18 10:12:41.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce0e5fea11bc'
+down_revision: Union[str, None] = '4dce975b7c99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Прежняя проверка через SELECT допускала гонку, поэтому в данных могут быть повторы transaction_id.
+    # Зачисления по ним уже отражены в балансах, поэтому строки не удаляются: повторам кроме первого
+    # добавляется суффикс, и история платежей остаётся согласованной с балансами.
+    op.execute("""
+        UPDATE payment p
+        SET transaction_id = p.transaction_id || '#dup-' || p.id
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY transaction_id ORDER BY ctid) AS rn
+            FROM payment
+        ) d
+        WHERE d.id = p.id AND d.rn > 1
+    """)
+    # Уникальный индекс обеспечивает идемпотентность вебхуков на уровне БД;
+    # CONCURRENTLY - без блокировки записи платежей на время построения
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_payment_transaction_id'), 'payment', ['transaction_id'], unique=True,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_payment_transaction_id'), table_name='payment', postgresql_concurrently=True)
@@ -0,0 +1,53 @@
+"""user balance summary row on user insert
+
+Revision ID: e51968174471
+Revises: 96d3740ce4d9
+Create Date: 2026-10-18 20:14:09.318542
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e51968174471'
+down_revision: Union[str, None] = '96d3740ce4d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Сводка создаётся для любого пользователя, в том числе вставленного bulk_create или SQL,
+    # иначе он не попадает в список пользователей, построенный от user_balance_summary
+    op.execute("""
+        CREATE FUNCTION user_balance_summary_init() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO user_balance_summary (user_id, account_count, total_balance)
+            VALUES (NEW.id, 0, 0)
+            ON CONFLICT (user_id) DO NOTHING;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER user_balance_summary_init AFTER INSERT ON "user"
+        FOR EACH ROW EXECUTE FUNCTION user_balance_summary_init()
+    """)
+    # Пользователи, созданные в обход RegistrationService после ревизии 2bb296f850e7
+    op.execute("""
+        INSERT INTO user_balance_summary (user_id, account_count, total_balance, last_payment_at)
+        SELECT u.id,
+               COUNT(a.id),
+               COALESCE(SUM(a.balance), 0),
+               (SELECT MAX(p.created_at) FROM payment p JOIN account pa ON pa.id = p.account_id
+                WHERE pa.user_id = u.id)
+        FROM "user" u
+        LEFT JOIN account a ON a.user_id = u.id
+        WHERE NOT EXISTS (SELECT 1 FROM user_balance_summary s WHERE s.user_id = u.id)
+        GROUP BY u.id
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER user_balance_summary_init ON "user"')
+    op.execute('DROP FUNCTION user_balance_summary_init()')
@@ -0,0 +1,26 @@
+"""payment created_at
+
+Revision ID: e86207f3e9f1
+Revises: b2a1cca9ad65
+Create Date: 2026-10-18 12:20:05.311948
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e86207f3e9f1'
+down_revision: Union[str, None] = 'b2a1cca9ad65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('payment', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+                                       nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('payment', 'created_at')
@@ -0,0 +1,181 @@
+"""
+Нагрузочный тест платёжного конвейера.
+
+Поднимает приложение в процессе (httpx + ASGITransport), создаёт отдельную схему
+в базе из настроек (.env) - подойдёт локальный одноразовый Postgres, например
+``docker run --rm -e POSTGRES_PASSWORD=postgres -p 5432:5432 postgres:14`` -
+заполняет её тестовыми пользователями и прогоняет сценарии с заданной конкурентностью:
+
+    webhook    POST /webhook/process-payment-webhook (уникальные транзакции)
+    login      POST /user/login/access-token
+    me         GET  /user/me
+    statement  GET  /account/account/{id}/statement
+
+Для каждого сценария выводятся пропускная способность, p50/p95/p99 задержки
+и среднее число запросов к БД на один HTTP-запрос. Любой ответ кроме 2xx прерывает
+прогон с ошибкой. Схема удаляется по завершении.
+
+Запуск:
+    python -m benchmarks.load_test --requests 2000 --concurrency 50
+    python -m benchmarks.load_test --scenarios webhook,me
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+import httpx
+from sqlalchemy import event, text
+from sqlmodel import SQLModel
+
+from backend.app.models import User, Account
+from backend.app.services.helpers import compute_signature
+from backend.core.config import settings
+from backend.core.db import engine, replica_engine, session_manager
+from backend.core.security import pwd_context
+from backend.main import app
+
+SCHEMA = "bench_load"
+PASSWORD = "bench"
+SCENARIOS = ("webhook", "login", "me", "statement")
+
+
+class UnexpectedStatus(Exception):
+    """Ответ не 2xx: результаты с ошибками не отражают производительность сценария."""
+
+
+class RoundTrips:
+    """Счётчик запросов к БД через события движка."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+round_trips = RoundTrips()
+
+
+def _set_search_path(dbapi_connection, connection_record):
+    # SET вне транзакции: иначе пул откатывает его при возврате соединения,
+    # и повторно выданное соединение снова смотрит в public
+    autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET SESSION search_path TO {SCHEMA}")
+    cursor.close()
+    dbapi_connection.autocommit = autocommit
+
+
+for _engine in filter(None, (engine, replica_engine)):
+    event.listen(_engine.sync_engine, "connect", _set_search_path, insert=True)
+    event.listen(_engine.sync_engine, "before_cursor_execute", round_trips)
+
+
+async def prepare_schema(users: int) -> list:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    hashed_password = pwd_context.hash(PASSWORD)
+    async with session_manager.create_session() as db:
+        async with session_manager.transaction(db):
+            accounts = []
+            for number in range(users):
+                user = User(email=f"bench{number}@example.com", hashed_password=hashed_password)
+                db.add(user)
+                await db.flush()
+                account = Account(account_number=f"BENCH-{number}", user_id=user.id, balance=Decimal("0.00"))
+                db.add(account)
+                await db.flush()
+                accounts.append((user.email, user.id, account.id))
+    return accounts
+
+
+async def drop_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+async def run_scenario(name: str, make_request, total: int, concurrency: int) -> None:
+    latencies = []
+    statuses = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for number in counter:
+            started = time.perf_counter()
+            response = await make_request(number)
+            latencies.append(time.perf_counter() - started)
+            if not response.is_success:
+                raise UnexpectedStatus(f"{name}: {response.request.method} {response.request.url.path} -> "
+                                       f"{response.status_code} {response.text[:200]}")
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    trips_before = round_trips.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{name:10s} {total / elapsed:9.1f} rps   "
+          f"p50 {p[49] * 1000:7.2f} ms   p95 {p[94] * 1000:7.2f} ms   p99 {p[98] * 1000:7.2f} ms   "
+          f"запросов к БД/запрос {(round_trips.count - trips_before) / total:5.2f}   статусы {statuses}")
+
+
+async def main(args) -> None:
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+    accounts = await prepare_schema(args.users)
+    prefix = settings.API_V1_STR
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            email, user_id, account_id = accounts[0]
+            response = await client.post(f"{prefix}/user/login/access-token",
+                                         data={"username": email, "password": PASSWORD})
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            def webhook(number):
+                _, owner_id, owner_account_id = accounts[number % len(accounts)]
+                fields = {"transaction_id": str(uuid.uuid4()), "account_id": owner_account_id,
+                          "user_id": owner_id, "amount": 100}
+                return client.post(f"{prefix}/webhook/process-payment-webhook",
+                                   json={**fields, "signature": compute_signature(fields)})
+
+            def login(number):
+                return client.post(f"{prefix}/user/login/access-token",
+                                   data={"username": accounts[number % len(accounts)][0], "password": PASSWORD})
+
+            def me(number):
+                return client.get(f"{prefix}/user/me", headers=headers)
+
+            def statement(number):
+                return client.get(f"{prefix}/account/account/{account_id}/statement", headers=headers)
+
+            requests = {"webhook": webhook, "login": login, "me": me, "statement": statement}
+            print(f"Запросов на сценарий: {args.requests}, конкурентность: {args.concurrency}, "
+                  f"пользователей: {args.users}")
+            for name in args.scenarios:
+                await run_scenario(name, requests[name], args.requests, args.concurrency)
+    finally:
+        if not args.keep:
+            await drop_schema()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=10, help="пользователей со счётом")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+                        help="сценарии через запятую: " + ",".join(SCENARIOS))
+    parser.add_argument("--keep", action="store_true", help="не удалять схему после запуска")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+Планы запросов выписки и /user/me до и после индексов ревизии 801ba6b09597.
+
+Скрипт создаёт отдельную схему в базе из настроек (.env), заполняет её тестовыми
+данными (по умолчанию миллион платежей), выводит EXPLAIN ANALYZE без индексов
+account(user_id) и payment(account_id, created_at, id), затем создаёт индексы
+и выводит планы повторно. Рабочие таблицы не затрагиваются.
+
+Запуск:
+    python -m benchmarks.query_plans --payments 1000000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from backend.app import models  # noqa: F401  регистрирует таблицы в metadata
+from backend.core.config import settings
+
+SCHEMA = "bench_query_plans"
+
+INDEXES = {
+    "ix_account_user_id": 'CREATE INDEX ix_account_user_id ON account (user_id)',
+    "ix_payment_account_id_created_at":
+        'CREATE INDEX ix_payment_account_id_created_at ON payment (account_id, created_at, id)',
+}
+
+QUERIES = {
+    "statement page (keyset)":
+        "SELECT * FROM payment WHERE account_id = 1 ORDER BY created_at DESC, id DESC LIMIT 51",
+    "/account/{id} selectinload(Account.payments)":
+        "SELECT * FROM payment WHERE account_id IN (1)",
+    "/user/me selectinload(User.accounts)":
+        'SELECT * FROM account WHERE user_id IN (1)',
+}
+
+
+async def seed(conn, users: int, accounts: int, payments: int, hot_share: float) -> None:
+    await conn.execute(text(
+        'INSERT INTO "user" (id, email, is_superuser, hashed_password) '
+        "SELECT i, 'user' || i || '@example.com', FALSE, 'x' FROM generate_series(1, :n) AS i"
+    ), {"n": users})
+    await conn.execute(text(
+        "INSERT INTO account (id, account_number, user_id, balance) "
+        "SELECT i, 'ACC-' || i, 1 + (i - 1) % :users, 0 FROM generate_series(1, :n) AS i"
+    ), {"n": accounts, "users": users})
+    # Доля платежей уходит на «горячий» счёт 1, остальные распределяются равномерно
+    await conn.execute(text(
+        "INSERT INTO payment (id, transaction_id, amount, account_id, created_at) "
+        "SELECT gen_random_uuid(), 'tx-' || i, 1 + i % 1000, "
+        "CASE WHEN random() < :hot THEN 1 ELSE 1 + (random() * (:accounts - 1))::int END, "
+        "now() - i * interval '1 second' "
+        "FROM generate_series(1, :n) AS i"
+    ), {"n": payments, "accounts": accounts, "hot": hot_share})
+    await conn.execute(text("ANALYZE"))
+
+
+async def explain_all(conn, title: str) -> None:
+    print(f"\n===== {title} =====")
+    for name, query in QUERIES.items():
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"))
+        print(f"\n--- {name}\n{query}")
+        for (line,) in result:
+            print(f"    {line}")
+
+
+async def main(args) -> None:
+    engine = create_async_engine(settings.database_url)
+    async with engine.connect() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        await conn.run_sync(SQLModel.metadata.create_all)
+        for index in INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        await conn.commit()
+
+        started = time.perf_counter()
+        await seed(conn, args.users, args.accounts, args.payments, args.hot_share)
+        await conn.commit()
+        print(f"Заполнено за {time.perf_counter() - started:.1f} с: "
+              f"{args.users} пользователей, {args.accounts} счетов, {args.payments} платежей")
+
+        await explain_all(conn, "без индексов")
+        for ddl in INDEXES.values():
+            await conn.execute(text(ddl))
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+        await explain_all(conn, "с индексами")
+
+        if not args.keep:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await conn.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--accounts", type=int, default=20_000)
+    parser.add_argument("--payments", type=int, default=1_000_000)
+    parser.add_argument("--hot-share", type=float, default=0.05, help="доля платежей на горячий счёт 1")
+    parser.add_argument("--keep", action="store_true", help="не удалять схему после запуска")
+    asyncio.run(main(parser.parse_args()))
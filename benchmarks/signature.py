@@ -0,0 +1,52 @@
+"""
+Стоимость проверки подписи одного вебхука: исходная реализация против текущей.
+
+Исходная реализация - model_dump, сортировка словаря, склейка строки через +=
+и сравнение через !=. Текущая - services.helpers.is_signature_valid
+(фиксированный порядок полей, один join, hmac.compare_digest).
+
+Запуск:
+    python -m benchmarks.signature --number 200000
+"""
+import argparse
+import hashlib
+import timeit
+
+from backend.app.models.schemas import WebhookRequest
+from backend.app.services.helpers import compute_signature, is_signature_valid, signature_matches
+from backend.core.config import settings
+
+
+def legacy_verify_signature(webhook_data: WebhookRequest) -> str:
+    sorted_data = dict(sorted(webhook_data.model_dump().items()))
+    signature_str = ""
+    for key, value in sorted_data.items():
+        if key != "signature":
+            signature_str += str(value)
+    signature_str += settings.SECRET_PAYMENT_KEY
+    return hashlib.sha256(signature_str.encode()).hexdigest()
+
+
+def main(number: int) -> None:
+    fields = {"transaction_id": "5eae174f-7cd0-472c-bd36-35660f00132b", "account_id": 1, "user_id": 1,
+              "amount": 100}
+    webhook = WebhookRequest(**fields, signature=compute_signature(fields))
+
+    cases = {
+        "исходная (model_dump + sort + += + !=)":
+            lambda: webhook.signature != legacy_verify_signature(webhook),
+        "is_signature_valid(модель)":
+            lambda: is_signature_valid(webhook),
+        "signature_matches(поля тела запроса)":
+            lambda: signature_matches(fields, webhook.signature),
+    }
+    print(f"Алгоритм подписи: {settings.WEBHOOK_SIGNATURE_ALGORITHM}, вызовов: {number}")
+    for name, call in cases.items():
+        best = min(timeit.repeat(call, number=number, repeat=5))
+        print(f"{name:45s} {best / number * 1e6:8.2f} мкс/вебхук")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000)
+    main(parser.parse_args().number)
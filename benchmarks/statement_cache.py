@@ -0,0 +1,74 @@
+"""
+Накладные расходы Python на построение запроса поиска: select(...).filter_by(...) на каждый
+вызов против готового выражения с bindparam из base_repositories.lookup_statement.
+
+Без --db измеряется построение выражения и вычисление ключа кэша компиляции SQLAlchemy -
+работа, которая выполняется при каждом execute до обращения к базе. С --db дополнительно
+выполняются запросы к базе из настроек (.env) через AsyncBaseRepository.get и эквивалентный
+запрос без кэша.
+
+Запуск:
+    python -m benchmarks.statement_cache --number 100000
+    python -m benchmarks.statement_cache --db --number 5000
+"""
+import argparse
+import asyncio
+import time
+import timeit
+
+from sqlalchemy import select
+
+from backend.app.models import User, Payment
+from backend.app.repositories.base_repositories import lookup_statement
+from backend.app.repositories.user_repositories import UserRepository
+from backend.core.db import engine, session_manager
+
+
+def python_overhead(number: int) -> None:
+    cases = {
+        "User по id: filter_by":
+            lambda: select(User).filter_by(id=1)._generate_cache_key(),
+        "User по id: lookup_statement":
+            lambda: lookup_statement(User, "select", ("id",))._generate_cache_key(),
+        "User по email: filter_by":
+            lambda: select(User).filter_by(email="user@example.com")._generate_cache_key(),
+        "User по email: lookup_statement":
+            lambda: lookup_statement(User, "select", ("email",))._generate_cache_key(),
+        "Payment exists: filter_by":
+            lambda: select(select(Payment).filter_by(transaction_id="tx").exists())._generate_cache_key(),
+        "Payment exists: lookup_statement":
+            lambda: lookup_statement(Payment, "exists", ("transaction_id",))._generate_cache_key(),
+    }
+    print(f"Построение выражения и ключа кэша, вызовов: {number}")
+    for name, call in cases.items():
+        best = min(timeit.repeat(call, number=number, repeat=5))
+        print(f"{name:40s} {best / number * 1e6:8.2f} мкс/вызов")
+
+
+async def database_round_trips(number: int) -> None:
+    repository = UserRepository()
+    async with session_manager.create_session() as db:
+        async def uncached():
+            result = await db.execute(select(User).filter_by(id=1))
+            return result.scalar_one_or_none()
+
+        cases = {"get(id=1): filter_by": uncached, "get(id=1): lookup_statement": lambda: repository.get(db, id=1)}
+        print(f"\nЗапросы к базе, вызовов: {number}")
+        for name, call in cases.items():
+            await call()  # прогрев кэша компиляции и подготовленных выражений
+            started = time.perf_counter()
+            for _ in range(number):
+                await call()
+            elapsed = time.perf_counter() - started
+            print(f"{name:40s} {elapsed / number * 1e6:8.2f} мкс/вызов")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--db", action="store_true", help="дополнительно выполнить запросы к базе")
+    args = parser.parse_args()
+    python_overhead(args.number)
+    if args.db:
+        asyncio.run(database_round_trips(args.number))
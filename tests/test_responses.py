@@ -0,0 +1,14 @@
+import json
+from decimal import Decimal
+
+from asyncpg.pgproto.pgproto import UUID as PgUUID
+
+from backend.core.responses import FastJSONResponse
+
+
+def test_fast_json_response_encodes_asyncpg_uuid_and_decimal():
+    payment_id = PgUUID("5b1f8c1e-9a43-4f0e-8a55-2d9a1f6f0c11")
+
+    body = FastJSONResponse({"id": payment_id, "amount": Decimal("10.50")}).body
+
+    assert json.loads(body) == {"id": "5b1f8c1e-9a43-4f0e-8a55-2d9a1f6f0c11", "amount": "10.50"}
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from backend.app.dependencies.auth_dep import get_current_principal
+from backend.app.dependencies.services import user_service
+from backend.app.models.schemas import Principal
+from backend.core.config import settings
+from backend.core.db import get_read_session
+from backend.main import app
+
+
+async def _no_session():
+    yield None
+
+
+def test_all_user_accepts_filters_limit_and_cursor_as_query_params(monkeypatch):
+    calls = []
+
+    async def list_users(db, filters, sort_by, descending, limit, after=None):
+        calls.append({"filters": filters, "sort_by": sort_by, "descending": descending, "limit": limit})
+        return []
+
+    monkeypatch.setattr(user_service.summary_repository, "list_users", list_users)
+    app.dependency_overrides[get_current_principal] = lambda: Principal(id=1, is_superuser=True)
+    app.dependency_overrides[get_read_session] = _no_session
+    try:
+        response = TestClient(app).get(
+            f"{settings.API_V1_STR}/user/all_user",
+            params={"sort_by": "total_balance", "order": "desc", "limit": 10},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"items": [], "next_cursor": None}
+    # Без is_superuser список не фильтруется по признаку суперпользователя
+    assert calls == [{"filters": [], "sort_by": "total_balance", "descending": True, "limit": 11}]